@@ -0,0 +1,78 @@
+from collections import deque
+
+
+def _is_word_char(ch):
+    return ch.isascii() and ch.isalnum()
+
+
+# --- Aho–Corasick 자동자: 여러 단어를 텍스트 한 번 훑어서 모두 찾음 ---
+class AhoCorasick:
+    """patterns의 위치(번호)로 결과를 돌려줌. 대소문자는 구분하지 않음.
+
+    영문/숫자로 시작하거나 끝나는 단어는 앞뒤가 영문/숫자가 아닐 때만 일치로 봄 ("SK"가 "SKT" 안에서 잡히지 않도록).
+    """
+
+    def __init__(self, patterns):
+        self.patterns = [p.lower() for p in patterns]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                next_node = self._goto[node].get(ch)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][ch] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = next_node
+            self._out[node].append(pattern_id)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                # 실패 링크 쪽에서 끝나는 단어도 함께 일치
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _boundary_ok(self, text, start, end):
+        pattern_start, pattern_end = text[start], text[end - 1]
+        if _is_word_char(pattern_start) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if _is_word_char(pattern_end) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def iter_matches(self, text):
+        """(시작 위치, 끝 위치, 단어 번호)를 모두 반환 (겹치는 일치 포함)."""
+        text = text.lower()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pattern_id in self._out[node]:
+                start = i + 1 - len(self.patterns[pattern_id])
+                if self._boundary_ok(text, start, i + 1):
+                    yield start, i + 1, pattern_id
+
+    def find_longest(self, text):
+        """겹치는 일치 중 가장 왼쪽·가장 긴 것만 남김 ("SK네트웍스" 안의 "SK"는 따로 세지 않음)."""
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        result, last_end = [], 0
+        for start, end, pattern_id in matches:
+            if start >= last_end:
+                result.append((start, end, pattern_id))
+                last_end = end
+        return result
@@ -0,0 +1,56 @@
+import html
+
+import pandas as pd
+
+from link_preview import render_preview_card
+
+
+def _text(value, default=""):
+    if value is None or (not isinstance(value, str) and pd.isna(value)) or value == "":
+        return default
+    return html.escape(str(value))
+
+
+def _related_html(related_df):
+    if related_df is None or related_df.empty:
+        return ""
+    links = []
+    for _, row in related_df.iterrows():
+        url = row.get("url")
+        source = _text(row.get("source"), "출처 없음")
+        links.append(f'<a href="{html.escape(url, quote=True)}" target="_blank">{source}</a>' if isinstance(url, str) and url else source)
+    return f'<li>🗞️ 같은 소식 {len(links)}건 더: {", ".join(links)}</li>'
+
+
+# --- 기사 목록을 하나의 HTML 블록으로 생성 (Streamlit 요소 하나로 출력) ---
+def build_articles_html(articles_df, ai_recommendations=(), vote_counts=None, preview_cards=None, related_articles=None):
+    """related_articles: 기사 ID → 같은 소식을 보도한 다른 매체 기사들(DataFrame)."""
+    vote_counts = vote_counts or {}
+    preview_cards = preview_cards or {}
+    related_articles = related_articles or {}
+    recommended = set(ai_recommendations)
+
+    parts = []
+    for idx, row in articles_df.iterrows():
+        badge = ' <span class="ai-recommend-badge">AI 추천</span>' if idx in recommended else ""
+        date_text = row["date"].strftime("%Y-%m-%d") if pd.notna(row.get("date")) else ""
+        if row.get("category_origin") == "model":
+            date_text += f' · 🤖 카테고리 자동 분류, 신뢰도 {row["category_confidence"]:.0%}'
+        parts.append('<div class="article-card">')
+        parts.append(f'<h3>💡 {_text(row.get("title"))}{badge}</h3>')
+        parts.append(
+            f'<ul><li>🏢 <b>{_text(row.get("source"))}</b> ({date_text})</li>'
+            f'<li>📌 {"🤖 자동 요약: " if row.get("summary_origin") == "auto" else ""}{_text(row.get("summary"), "요약 없음")}</li>'
+            f'{_related_html(related_articles.get(idx))}</ul>'
+        )
+        likes, dislikes = vote_counts.get(idx, (0, 0))
+        parts.append(f'<div class="article-votes">👍 {likes} | 👎 {dislikes}</div>')
+
+        url = row.get("url")
+        if row.get("link_status") == "dead":
+            parts.append('<span class="article-dead-link">🔗 원문 링크가 끊겼습니다</span>')
+        elif isinstance(url, str) and url:
+            parts.append(f'<a href="{html.escape(url, quote=True)}" target="_blank">📖 본문 보기</a>')
+            parts.append(render_preview_card(preview_cards.get(url), url))
+        parts.append("</div><hr>")
+    return "".join(parts)
@@ -0,0 +1,279 @@
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+
+from kv_cache import CACHE_DIR, BATCH_SIZE
+from link_preview import USER_AGENT, decode_html
+
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+MIN_PARAGRAPH_CHARS = 20
+FAILURE_RETRY_SECONDS = 24 * 60 * 60  # 실패한 기사는 하루 뒤에 다시 시도
+
+# 본문이 아닌 영역 (메뉴, 광고, 스크립트 등)
+_SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "button"}
+_BLOCK_TAGS = {"p", "li", "h1", "h2", "h3", "blockquote", "div", "section", "article", "br", "td"}
+
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self.article_paragraphs = []
+        self.blocks = []
+        self._skip_depth = 0
+        self._article_depth = 0
+        self._paragraph = None
+        self._block = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "article":
+            self._article_depth += 1
+        if tag == "p":
+            self._paragraph = []
+        if tag in _BLOCK_TAGS:
+            self._end_block()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "article":
+            self._article_depth = max(0, self._article_depth - 1)
+        if tag == "p" and self._paragraph is not None:
+            text = " ".join("".join(self._paragraph).split())
+            if len(text) >= MIN_PARAGRAPH_CHARS:
+                (self.article_paragraphs if self._article_depth else self.paragraphs).append(text)
+            self._paragraph = None
+        if tag in _BLOCK_TAGS:
+            self._end_block()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+        self._block.append(data)
+
+    def _end_block(self):
+        text = " ".join("".join(self._block).split())
+        if text:
+            self.blocks.append(text)
+        self._block = []
+
+
+# --- 기사 페이지에서 본문 추출 (<article> 안의 문단 → 전체 문단 → 긴 텍스트 블록 순) ---
+def extract_main_text(page_html):
+    parser = _TextParser()
+    parser.feed(page_html)
+    parser.close()
+    parser._end_block()
+    paragraphs = parser.article_paragraphs or parser.paragraphs
+    if not paragraphs:
+        # 문단 태그를 쓰지 않는 사이트는 긴 텍스트 블록을 본문으로 봄
+        paragraphs = [b for b in parser.blocks if len(b) >= 2 * MIN_PARAGRAPH_CHARS]
+    return "\n".join(paragraphs)
+
+
+class RetryableFetchError(Exception):
+    pass
+
+
+def fetch_body(url, timeout=10):
+    """본문 텍스트를 반환. 다시 시도할 만한 오류(연결 실패, 5xx, 429)는 RetryableFetchError."""
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            raw = response.read(MAX_PAGE_BYTES)
+            return extract_main_text(decode_html(raw, response.headers.get("Content-Type")))
+    except urllib.error.HTTPError as e:
+        if e.code >= 500 or e.code == 429:
+            raise RetryableFetchError(f"HTTP {e.code}") from e
+        raise
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise RetryableFetchError(str(e)) from e
+
+
+# --- 기사 본문 저장소 (기사 ID별로 zlib 압축해 SQLite에 저장) ---
+class BodyStore:
+    def __init__(self, name="article_bodies", cache_dir=None):
+        cache_dir = cache_dir or CACHE_DIR
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{name}.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bodies ("
+            "article_id TEXT PRIMARY KEY, url TEXT NOT NULL, body BLOB, error TEXT, fetched_at REAL NOT NULL, chars INTEGER)"
+        )
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        # 본문 길이(chars) 컬럼이 없던 저장소는 한 번만 채움 (이후에는 압축을 풀지 않고 길이를 읽음)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(bodies)")}
+        if "chars" not in columns:
+            self._conn.execute("ALTER TABLE bodies ADD COLUMN chars INTEGER")
+        rows = self._conn.execute("SELECT article_id, body FROM bodies WHERE chars IS NULL AND body IS NOT NULL").fetchall()
+        self._conn.executemany(
+            "UPDATE bodies SET chars = ? WHERE article_id = ?",
+            [(len(zlib.decompress(body).decode("utf-8")), idx) for idx, body in rows],
+        )
+
+    def _select(self, ids, columns):
+        ids = list(dict.fromkeys(ids))
+        rows = []
+        with self._lock:
+            for i in range(0, len(ids), BATCH_SIZE):
+                chunk = ids[i:i + BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows += self._conn.execute(
+                    f"SELECT article_id, {columns} FROM bodies WHERE article_id IN ({placeholders})", chunk
+                ).fetchall()
+        return rows
+
+    def get_many(self, ids):
+        """본문이 있는 기사만 {기사 ID: 본문}으로 반환."""
+        rows = self._select(ids, "body")
+        return {idx: zlib.decompress(body).decode("utf-8") for idx, body in rows if body is not None}
+
+    def info(self, ids):
+        """본문이 있는 기사만 {기사 ID: (본문 길이, 받은 시각)} (압축은 풀지 않음)."""
+        return {idx: (chars, fetched_at) for idx, chars, fetched_at in self._select(ids, "chars, fetched_at") if chars}
+
+    def settled(self, ids, retry_after=FAILURE_RETRY_SECONDS):
+        """본문을 가져왔거나 최근에 실패해서 다시 가져올 필요가 없는 기사 ID."""
+        cutoff = time.time() - retry_after
+        return {idx for idx, has_body, fetched_at in self._select(ids, "body IS NOT NULL, fetched_at") if has_body or fetched_at > cutoff}
+
+    def put(self, article_id, url, body=None, error=None):
+        blob = zlib.compress(body.encode("utf-8"), 6) if body else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bodies (article_id, url, body, error, fetched_at, chars) VALUES (?, ?, ?, ?, ?, ?)",
+                (article_id, url, blob, error, time.time(), len(body) if body else None),
+            )
+            self._conn.commit()
+
+
+# --- 수집 단계에서 쓰는 기사 본문 (길이/버전만 먼저 읽고, 본문은 필요한 기사만 압축을 풂) ---
+class ArticleBodies:
+    """저장소에서 받은 본문이 우선이고, 없으면 소스가 제공한 본문 컬럼(body) 사용."""
+
+    def __init__(self, df, store):
+        self._store = store
+        self._inline = df["body"].dropna().astype(str).to_dict() if "body" in df.columns else {}
+        self._stored = store.info(df.index)
+
+    def __contains__(self, idx):
+        return idx in self._stored or idx in self._inline
+
+    def chars(self, idx):
+        if idx in self._stored:
+            return self._stored[idx][0]
+        return len(self._inline.get(idx, ""))
+
+    def version(self, idx):
+        """본문이 바뀌면 달라지는 값 (받은 시각, 소스 본문은 CRC). 본문이 없으면 None."""
+        if idx in self._stored:
+            return f"store:{self._stored[idx][1]}"
+        if idx in self._inline:
+            return f"source:{zlib.crc32(self._inline[idx].encode('utf-8'))}"
+        return None
+
+    def get_many(self, ids):
+        ids = [idx for idx in ids if idx in self]
+        bodies = {idx: self._inline[idx] for idx in ids if idx in self._inline}
+        bodies.update(self._store.get_many([idx for idx in ids if idx in self._stored]))
+        return bodies
+
+
+# --- 기사 본문 동시 수집 (사이트별 동시 요청 수 제한, 일시적 오류는 재시도) ---
+# 사이트마다 대기열을 두고 빈 자리가 있는 사이트의 기사만 스레드 풀에 넘김 (느린 사이트가 풀 전체를 차지하지 않도록)
+class BodyFetcher:
+    def __init__(self, store, max_workers=8, per_domain=2, retries=2, backoff=1.0, timeout=10, fetch=fetch_body, on_update=None):
+        self.store = store
+        self.per_domain = per_domain
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._fetch = fetch
+        # 이번에 요청한 기사를 모두 받으면 호출 (데이터 갱신 요청 등)
+        self.on_update = on_update
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="body")
+        self._lock = threading.Lock()
+        self._queues = {}    # 사이트 → 대기 중인 (기사 ID, URL)
+        self._active = {}    # 사이트 → 가져오는 중인 기사 수
+        self._pending = set()
+        self._fetched = 0
+
+    def _dispatch(self, domain):
+        """사이트의 빈 자리만큼 대기열에서 꺼내 풀에 넘김 (self._lock을 잡은 상태에서 호출)."""
+        queue = self._queues.get(domain)
+        while queue and self._active.get(domain, 0) < self.per_domain:
+            idx, url = queue.popleft()
+            self._active[domain] = self._active.get(domain, 0) + 1
+            self._executor.submit(self._fetch_one, domain, idx, url)
+        if not queue:
+            self._queues.pop(domain, None)
+
+    def schedule(self, items):
+        """items: {기사 ID: URL}. 저장소에 없는 기사만 백그라운드로 가져오고, 요청한 개수를 반환."""
+        items = {idx: url for idx, url in items.items() if url}
+        settled = self.store.settled(items)
+        with self._lock:
+            todo = {idx: url for idx, url in items.items() if idx not in settled and idx not in self._pending}
+            self._pending.update(todo)
+            domains = set()
+            for idx, url in todo.items():
+                domain = urllib.parse.urlsplit(url).netloc.lower()
+                self._queues.setdefault(domain, deque()).append((idx, url))
+                domains.add(domain)
+            for domain in domains:
+                self._dispatch(domain)
+        return len(todo)
+
+    def _fetch_one(self, domain, idx, url):
+        body, error = None, None
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    body = self._fetch(url, timeout=self.timeout)
+                    break
+                except RetryableFetchError as e:
+                    error = str(e)
+                    if attempt < self.retries:
+                        time.sleep(self.backoff * 2 ** attempt)
+            if body is not None:
+                error = None
+        except Exception as e:
+            error = str(e)
+        try:
+            self.store.put(idx, url, body or None, error or (None if body else "본문 없음"))
+        finally:
+            with self._lock:
+                self._active[domain] -= 1
+                if not self._active[domain]:
+                    del self._active[domain]
+                # 자리가 났으니 같은 사이트의 다음 기사를 넘김
+                self._dispatch(domain)
+                self._pending.discard(idx)
+                if body:
+                    self._fetched += 1
+                finished = not self._pending
+                fetched, self._fetched = (self._fetched, 0) if finished else (0, self._fetched)
+            if finished and fetched and self.on_update is not None:
+                self.on_update()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
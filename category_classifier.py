@@ -0,0 +1,120 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from text_utils import article_text, tokenize
+
+# 이보다 확신이 낮으면 예측 대신 테마 이름을 카테고리로 사용 (기존 방식)
+MIN_CONFIDENCE = 0.5
+# 학습에 쓸 카테고리별 최소 기사 수
+MIN_CLASS_EXAMPLES = 2
+SMOOTHING = 0.5
+
+
+# --- 다항 나이브 베이즈 카테고리 분류기 (카테고리가 있는 기사로 학습) ---
+class NaiveBayesCategoryClassifier:
+    def fit(self, texts, labels, themes):
+        counts = Counter(labels)
+        keep = [i for i, label in enumerate(labels) if counts[label] >= MIN_CLASS_EXAMPLES]
+        self.classes = sorted({labels[i] for i in keep})
+        if not self.classes:
+            return self
+        class_index = {c: i for i, c in enumerate(self.classes)}
+        token_lists = [tokenize(texts[i]) for i in keep]
+        self.vocab = {t: i for i, t in enumerate(sorted({t for tokens in token_lists for t in tokens}))}
+
+        rows, columns = [], []
+        for i, tokens in zip(keep, token_lists):
+            for token in tokens:
+                rows.append(class_index[labels[i]])
+                columns.append(self.vocab[token])
+        term_counts = np.zeros((len(self.classes), len(self.vocab)), dtype=np.float64)
+        np.add.at(term_counts, (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)), 1.0)
+        smoothed = term_counts + SMOOTHING
+        self.log_likelihood = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        class_sizes = np.bincount([class_index[labels[i]] for i in keep], minlength=len(self.classes))
+        self.log_prior = np.log(class_sizes / class_sizes.sum())
+
+        # 테마마다 실제로 쓰인 카테고리만 후보로 삼음 (테마 아래 세부 분류이므로)
+        self.theme_classes = {}
+        for i in keep:
+            self.theme_classes.setdefault(themes[i], set()).add(class_index[labels[i]])
+        return self
+
+    def predict(self, texts, themes):
+        """(카테고리 목록, 확신도 목록). 예측할 수 없으면 카테고리는 None, 확신도는 0."""
+        if not getattr(self, "classes", None) or not texts:
+            return [None] * len(texts), np.zeros(len(texts))
+        doc_ids, columns = [], []
+        for doc_id, text in enumerate(texts):
+            for token in tokenize(text):
+                column = self.vocab.get(token)
+                if column is not None:
+                    doc_ids.append(doc_id)
+                    columns.append(column)
+        scores = np.tile(self.log_prior, (len(texts), 1))
+        np.add.at(scores, np.array(doc_ids, dtype=np.int64), self.log_likelihood[:, np.array(columns, dtype=np.int64)].T)
+
+        # 학습 데이터에 없는 테마의 기사는 다른 테마의 카테고리를 고르지 않도록 예측하지 않음
+        allowed = np.ones_like(scores, dtype=bool)
+        known_theme = np.zeros(len(texts), dtype=bool)
+        for doc_id, theme in enumerate(themes):
+            theme_classes = self.theme_classes.get(theme)
+            if theme_classes:
+                known_theme[doc_id] = True
+                allowed[doc_id] = False
+                allowed[doc_id, list(theme_classes)] = True
+        scores = np.where(allowed, scores, -np.inf)
+        # 로그 점수를 확률로 바꿔 가장 높은 확률을 확신도로 사용
+        probabilities = np.exp(scores - scores.max(axis=1, keepdims=True))
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        has_tokens = np.bincount(np.array(doc_ids, dtype=np.int64), minlength=len(texts)) > 0
+        predictable = has_tokens & known_theme
+        labels = [self.classes[b] if ok else None for b, ok in zip(best, predictable)]
+        return labels, np.where(predictable, probabilities.max(axis=1), 0.0)
+
+
+# --- 수집 단계: 카테고리가 빈 기사(테마로 채워진 행)를 예측값으로 채움 ---
+def fill_missing_categories(df, cache=None, min_confidence=MIN_CONFIDENCE):
+    """category_origin이 "theme"인 행을 예측해 "model"로 바꾸고 category_confidence를 기록한 사본을 반환.
+
+    cache: 기사 ID별 예측 결과를 저장할 KVCache (한 번 예측한 기사는 다시 계산하지 않음).
+    """
+    df = df.copy()
+    df["category_confidence"] = np.nan
+    if "category_origin" not in df.columns:
+        return df
+    missing = df.index[df["category_origin"] == "theme"]
+    if missing.empty:
+        return df
+
+    cached = cache.get_many(missing) if cache is not None else {}
+    todo = [idx for idx in missing if idx not in cached]
+    if todo:
+        labeled = df[df["category_origin"] == "sheet"]
+        classifier = NaiveBayesCategoryClassifier().fit(
+            article_text(labeled), labeled["category"].astype(str).tolist(), labeled["theme"].astype(str).tolist()
+        )
+        todo_df = df.loc[todo]
+        labels, confidences = classifier.predict(article_text(todo_df), todo_df["theme"].astype(str).tolist())
+        predictions = {idx: {"category": label, "confidence": round(float(c), 4)} for idx, label, c in zip(todo, labels, confidences)}
+        if cache is not None:
+            # 채택한 예측만 저장 (예측하지 못했거나 확신이 낮은 기사는 학습 데이터가 늘어난 뒤 다시 시도)
+            cache.set_many({
+                idx: p for idx, p in predictions.items()
+                if p["category"] is not None and p["confidence"] >= min_confidence
+            })
+        cached.update(predictions)
+
+    predicted = pd.DataFrame.from_dict({idx: cached[idx] for idx in missing}, orient="index")
+    accepted = predicted.index[predicted["category"].notna() & (predicted["confidence"] >= min_confidence)]
+    df.loc[predicted.index, "category_confidence"] = predicted["confidence"].astype(float)
+    category = df["category"].astype("string")
+    origin = df["category_origin"].astype("string")
+    category[accepted] = predicted.loc[accepted, "category"].astype("string")
+    origin[accepted] = "model"
+    df["category"] = category.astype("category")
+    df["category_origin"] = origin.astype("category")
+    return df
@@ -0,0 +1,182 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from news_data import ARTICLE_COLUMNS, compact_articles, normalize_articles
+
+DEFAULT_TTL_SECONDS = 5 * 60
+
+
+# --- 소스별 상태 기록 (성공/실패 횟수, 응답 시간, 행 수) ---
+class ConnectorHealth:
+    def __init__(self):
+        self.last_success_at = None
+        self.last_failure_at = None
+        self.last_error = None
+        self.last_latency = None
+        self.rows = 0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cache_hits = 0
+
+    def as_dict(self):
+        return dict(self.__dict__, last_error=str(self.last_error) if self.last_error else None)
+
+
+# --- 소스 커넥터 기본 클래스 (fetch만 구현하면 정리/ID 부여/캐시/상태 기록은 공통) ---
+class SourceConnector:
+    kind = "base"
+
+    def __init__(self, name, ttl=DEFAULT_TTL_SECONDS, required_columns=()):
+        self.name = name
+        self.ttl = ttl
+        self.required_columns = set(required_columns)
+        self.health = ConnectorHealth()
+        self._cached = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+
+    def fetch(self):
+        raise NotImplementedError
+
+    def load(self, force=False):
+        with self._lock:
+            if not force and self._cached is not None and time.time() - self._cached_at < self.ttl:
+                self.health.cache_hits += 1
+                return self._cached
+            started = time.time()
+            try:
+                raw = self.fetch()
+                missing = self.required_columns - {str(c).strip() for c in raw.columns}
+                if missing:
+                    raise ValueError(f"필수 컬럼 누락: {missing}")
+                frame = normalize_articles(raw, origin=self.name)
+            except Exception as e:
+                self.health.failures += 1
+                self.health.consecutive_failures += 1
+                self.health.last_failure_at = time.time()
+                self.health.last_error = e
+                raise
+            self.health.successes += 1
+            self.health.consecutive_failures = 0
+            self.health.last_success_at = time.time()
+            self.health.last_latency = self.health.last_success_at - started
+            self.health.last_error = None
+            self.health.rows = len(frame)
+            self._cached, self._cached_at = frame, time.time()
+            return frame
+
+
+class CsvUrlConnector(SourceConnector):
+    kind = "csv"
+
+    def __init__(self, name, url, **kwargs):
+        super().__init__(name, **kwargs)
+        self.url = url
+
+    def fetch(self):
+        return pd.read_csv(self.url)
+
+
+class SheetsConnector(SourceConnector):
+    kind = "sheets"
+
+    def __init__(self, name, credentials, spreadsheet, worksheet=None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.credentials = credentials
+        self.spreadsheet = spreadsheet
+        self.worksheet = worksheet
+
+    def fetch(self):
+        from sheets_client import get_client, open_spreadsheet, read_columns
+        client = get_client(self.credentials)
+        return read_columns(open_spreadsheet(client, self.spreadsheet), ARTICLE_COLUMNS, self.worksheet)
+
+
+class DriveFileConnector(SourceConnector):
+    kind = "drive"
+
+    def __init__(self, name, file_id, loader=None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.file_id = file_id
+        self._loader = loader
+
+    def fetch(self):
+        if self._loader is None:
+            from drive_loader import DriveLoader
+            self._loader = DriveLoader()
+        return self._loader.load(self.file_id)
+
+
+class ExcelConnector(SourceConnector):
+    """로컬 경로나 업로드된 파일 내용(bytes)의 엑셀 파일."""
+    kind = "excel"
+
+    def __init__(self, name, source, sheet=None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.source = source
+        self.sheet = sheet
+
+    def fetch(self):
+        from excel_ingest import load_uploaded_workbook
+        if isinstance(self.source, bytes):
+            return load_uploaded_workbook(self.source, sheet=self.sheet)
+        with open(self.source, "rb") as f:
+            return load_uploaded_workbook(f.read(), sheet=self.sheet)
+
+
+class JsonlConnector(SourceConnector):
+    """한 줄에 기사 하나인 JSON Lines (경로 또는 URL)."""
+    kind = "jsonl"
+
+    def __init__(self, name, source, **kwargs):
+        super().__init__(name, **kwargs)
+        self.source = source
+
+    def fetch(self):
+        source = io.BytesIO(self.source) if isinstance(self.source, bytes) else self.source
+        return pd.read_json(source, lines=True, dtype=False)
+
+
+class InlineConnector(SourceConnector):
+    """코드에 직접 적은 기사 목록 (app.py의 샘플 데이터 등)."""
+    kind = "inline"
+
+    def __init__(self, name, records, **kwargs):
+        super().__init__(name, **kwargs)
+        self.records = records
+
+    def fetch(self):
+        return pd.DataFrame.from_records(self.records)
+
+
+# --- 여러 소스를 동시에 읽어 하나의 데이터셋으로 합침 ---
+def fetch_all(connectors, max_workers=4, force=False):
+    """(합친 데이터, 실패한 소스 이름별 오류)를 반환. 같은 기사는 먼저 등록된 소스의 행을 사용."""
+    connectors = list(connectors)
+    results, errors = {}, {}
+    if connectors:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(connectors)))) as executor:
+            futures = {executor.submit(c.load, force): c for c in connectors}
+            for future in as_completed(futures):
+                connector = futures[future]
+                try:
+                    results[connector.name] = future.result()
+                except Exception as e:
+                    errors[connector.name] = e
+
+    frames = [results[c.name] for c in connectors if c.name in results]
+    if not frames:
+        return compact_articles(normalize_articles(pd.DataFrame(columns=ARTICLE_COLUMNS))), errors
+    merged = pd.concat(frames) if len(frames) > 1 else frames[0]
+    merged = merged[~merged.index.duplicated(keep="first")]
+    # 여러 소스를 합친 뒤에 category 타입으로 바꿔야 값 목록이 하나로 통일됨
+    return compact_articles(merged), errors
+
+
+def health_report(connectors):
+    return {c.name: dict(c.health.as_dict(), kind=c.kind) for c in connectors}
@@ -0,0 +1,76 @@
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from news_data import NO_DAY
+
+CUBE_DIMENSIONS = ["day", "theme", "category", "source"]
+_UNSEEN = object()
+
+
+# --- 수집 단계: 기사별 (날짜, 테마, 카테고리, 출처) 키를 유지하며 칸별 기사 수를 갱신 ---
+class CubeCounter:
+    """새 기사는 더하고, 키가 바뀌거나 사라진 기사는 이전 칸에서 뺌 (데이터 전체를 다시 묶지 않음)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}        # 기사 ID → 칸 키 (날짜 없음/빈 값이 있으면 None)
+        self._counts = Counter()
+
+    def update(self, df):
+        """(day, theme, category, source, n) 집계표를 반환 (스냅샷과 함께 게시)."""
+        columns = [df["day"].tolist()] + [df[c].astype("string").tolist() for c in CUBE_DIMENSIONS[1:]]
+        with self._lock:
+            current = set(df.index)
+            for idx in [idx for idx in self._keys if idx not in current]:
+                key = self._keys.pop(idx)
+                if key is not None:
+                    self._counts[key] -= 1
+            for idx, *values in zip(df.index, *columns):
+                key = None if values[0] == NO_DAY or any(pd.isna(v) for v in values[1:]) else tuple(values)
+                previous = self._keys.get(idx, _UNSEEN)
+                if previous == key:
+                    continue
+                if previous is not None and previous is not _UNSEEN:
+                    self._counts[previous] -= 1
+                if key is not None:
+                    self._counts[key] += 1
+                self._keys[idx] = key
+            for key in [key for key, n in self._counts.items() if n <= 0]:
+                del self._counts[key]
+            rows = [key + (n,) for key, n in self._counts.items()]
+        return pd.DataFrame(rows, columns=CUBE_DIMENSIONS + ["n"])
+
+
+# --- 한 데이터셋 버전의 날짜×테마×카테고리×출처별 기사 수 (게시된 집계표를 읽기만 함) ---
+class CountCube:
+    """기간별/그룹별 기사 수를 원본 행 대신 미리 집계한 값에서 계산. 만든 뒤에는 바뀌지 않음."""
+
+    def __init__(self, frame=None):
+        if frame is None:
+            frame = pd.DataFrame({"day": pd.Series(dtype="int64"), "theme": [], "category": [], "source": [], "n": pd.Series(dtype="int64")})
+        self._cube = frame.set_index(CUBE_DIMENSIONS)["n"].astype("int64").sort_index()
+        # 날짜 구간은 정렬된 day 값에서 이진 탐색으로 잘라냄
+        self._days = self._cube.index.get_level_values("day").to_numpy()
+
+    def counts(self, first_day, last_day, by=("theme", "category"), themes=None):
+        cube, days = self._cube, self._days
+        start = np.searchsorted(days, first_day, side="left")
+        end = np.searchsorted(days, last_day, side="right")
+        selected = cube.iloc[start:end]
+        if themes:
+            selected = selected[selected.index.get_level_values("theme").isin(list(themes))]
+        return selected.groupby(level=list(by), observed=True).sum()
+
+    # --- 두 기간 비교 (증감 수와 증감률) ---
+    def compare(self, current, previous, by=("theme", "category"), themes=None):
+        """current/previous: (첫 날, 마지막 날) 정수 일자 쌍."""
+        now = self.counts(*current, by=by, themes=themes).rename("이번 기간")
+        before = self.counts(*previous, by=by, themes=themes).rename("이전 기간")
+        table = pd.concat([now, before], axis=1).fillna(0).astype("int64")
+        table["증감"] = table["이번 기간"] - table["이전 기간"]
+        # 이전 기간에 없던 항목은 증감률 대신 빈 값
+        table["증감률(%)"] = (table["증감"] / table["이전 기간"].where(table["이전 기간"] > 0) * 100).round(1)
+        return table.sort_values(["이번 기간", "증감"], ascending=False)
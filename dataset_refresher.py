@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from shared_snapshot import SharedSnapshotStore
+
+# extras: 수집 단계에서 frame과 함께 만든 집계표 {이름: DataFrame} (화면 실행에서는 읽기만 함)
+Snapshot = namedtuple("Snapshot", ["version", "frame", "loaded_at", "content_hash", "extras"])
+
+
+def frame_hash(df):
+    return f"{len(df)}:{int(pd.util.hash_pandas_object(df, index=True).sum()) & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+# --- 데이터셋 백그라운드 갱신 (실패해도 마지막 정상 스냅샷을 계속 제공) ---
+# 여러 프로세스로 실행하면 한 프로세스만 loader를 호출하고, 나머지는 공유 스냅샷 파일을 따라감
+# loader는 DataFrame 또는 (DataFrame, extras) 를 반환
+class DatasetRefresher:
+    def __init__(self, loader, name="articles", interval=300, retry_interval=30, poll_interval=5, cache_dir=None):
+        self._loader = loader
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.poll_interval = poll_interval
+        self._store = SharedSnapshotStore(name, cache_dir)
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._wake = threading.Event()
+        self._snapshot = None
+        self.last_error = None
+        self.last_attempt_at = None
+        self._thread = None
+        self._restore()
+
+    # 재시작 직후에도 네트워크를 기다리지 않도록 디스크의 마지막 스냅샷부터 제공
+    def _restore(self):
+        manifest = self._store.manifest()
+        if manifest is None:
+            return
+        try:
+            self._adopt(manifest)
+        except Exception:
+            return
+        self._loaded.set()
+
+    def _adopt(self, manifest):
+        with self._lock:
+            current = self._snapshot
+        if current is not None and current.version == manifest["version"]:
+            frame, extras = current.frame, current.extras
+        else:
+            frame, extras = self._store.load(manifest), self._store.load_extras(manifest)
+        with self._lock:
+            self._snapshot = Snapshot(manifest["version"], frame, manifest["loaded_at"], manifest["content_hash"], extras)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dataset-refresher", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            if self._store.acquire_writer():
+                ok = self.refresh()
+                wait = self.interval if ok else self.retry_interval
+            else:
+                self.follow()
+                wait = self.poll_interval
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    # 다른 프로세스가 새 버전을 쓰면 그 파일로 교체
+    def follow(self):
+        manifest = self._store.manifest()
+        if manifest is None:
+            return False
+        try:
+            self._adopt(manifest)
+        except Exception as e:
+            self.last_error = e
+            return False
+        self.last_error = None
+        self._loaded.set()
+        return True
+
+    def request_refresh(self):
+        self._wake.set()
+
+    def refresh(self):
+        self.last_attempt_at = time.time()
+        try:
+            result = self._loader()
+            frame, extras = result if isinstance(result, tuple) else (result, {})
+            content_hash = frame_hash(frame)
+        except Exception as e:
+            self.last_error = e
+            return False
+        self.last_error = None
+        with self._lock:
+            current = self._snapshot
+        # 다른 프로세스가 쓰던 버전 번호를 이어받음
+        manifest = self._store.manifest()
+        latest = max(current.version if current is not None else 0, manifest["version"] if manifest else 0)
+        unchanged = (
+            current is not None and current.content_hash == content_hash and current.version == latest
+            # 집계표 구성이 바뀌었으면(이전 버전에서 재시작 등) 새 버전으로 씀
+            and current.extras.keys() == extras.keys()
+        )
+        if unchanged:
+            # 내용이 같으면 버전을 올리지 않고 확인 시각만 갱신
+            snapshot = current._replace(loaded_at=time.time())
+        else:
+            snapshot = Snapshot(latest + 1, frame, time.time(), content_hash, extras)
+        try:
+            manifest = self._store.publish(snapshot, write_data=not unchanged)
+            # 이 프로세스도 불러온 데이터 대신 공유 파일의 메모리 맵을 사용
+            if not unchanged:
+                snapshot = snapshot._replace(frame=self._store.load(manifest))
+        except Exception:
+            # 공유 파일을 쓰지 못하면 이 프로세스만 메모리의 데이터로 계속 제공
+            pass
+        with self._lock:
+            self._snapshot = snapshot
+        self._loaded.set()
+        return True
+
+    def current(self, wait=None):
+        # 스냅샷이 하나도 없을 때(최초 실행)만 첫 로드를 기다림
+        if wait and not self._loaded.is_set():
+            self._loaded.wait(wait)
+        return self._snapshot
+
+    def age_seconds(self):
+        snapshot = self._snapshot
+        return None if snapshot is None else time.time() - snapshot.loaded_at
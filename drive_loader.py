@@ -0,0 +1,104 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.request
+
+import gdown
+
+from excel_ingest import read_workbook, workbook_cache_key
+from frame_cache import load_frame, save_frame
+from kv_cache import KVCache
+
+DRIVE_DOWNLOAD_URL = "https://drive.google.com/uc?id={file_id}&export=download"
+CHECK_INTERVAL_SECONDS = 60
+
+
+def extract_file_id(gdrive_url):
+    match = re.search(r"/d/([\w-]+)", gdrive_url or "") or re.search(r"[?&]id=([\w-]+)", gdrive_url or "")
+    return match.group(1) if match else None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# 다운로드 없이 HEAD 요청의 ETag/Last-Modified/크기로 파일 변경 여부를 확인
+# 크기만으로는 같은 크기의 수정을 알 수 없으므로 ETag나 Last-Modified가 없으면 지문 없음(내려받아 해시 비교)
+def remote_fingerprint(file_id, timeout=10):
+    request = urllib.request.Request(DRIVE_DOWNLOAD_URL.format(file_id=file_id), method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            headers = response.headers
+            parts = [headers.get("ETag"), headers.get("Last-Modified"), headers.get("Content-Length")]
+    except Exception:
+        return None
+    return "|".join(p or "" for p in parts) if parts[0] or parts[1] else None
+
+
+# --- Google Drive 파일 로더 (파일 ID별 상태와 내용 해시별 변환 결과를 캐시) ---
+class DriveLoader:
+    def __init__(self, parse=read_workbook, check_interval=CHECK_INTERVAL_SECONDS):
+        self.parse = parse
+        self.check_interval = check_interval
+        self._state = KVCache("drive_files")
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, file_id):
+        with self._locks_lock:
+            return self._locks.setdefault(file_id, threading.Lock())
+
+    def _cached(self, state):
+        return load_frame(workbook_cache_key(state["content_hash"])) if state else None
+
+    def load(self, file_id):
+        # 같은 파일을 여러 세션이 동시에 요청하면 한 번만 내려받음
+        with self._lock_for(file_id):
+            state = self._state.get(file_id)
+            if state and time.time() - state["checked_at"] < self.check_interval:
+                frame = self._cached(state)
+                if frame is not None:
+                    return frame
+
+            fingerprint = remote_fingerprint(file_id)
+            if state and fingerprint and fingerprint == state.get("fingerprint"):
+                frame = self._cached(state)
+                if frame is not None:
+                    self._state.set(file_id, dict(state, checked_at=time.time()))
+                    return frame
+
+            frame, content_hash = self._download(file_id)
+            self._state.set(file_id, {
+                "fingerprint": fingerprint,
+                "content_hash": content_hash,
+                "checked_at": time.time(),
+            })
+            return frame
+
+    def _download(self, file_id):
+        # 세션마다 별도의 임시 파일에 내려받아 공유 파일 덮어쓰기 충돌을 피함
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            if gdown.download(DRIVE_DOWNLOAD_URL.format(file_id=file_id), path, quiet=True) is None:
+                raise RuntimeError("Google Drive 파일을 내려받지 못했습니다.")
+            content_hash = file_sha256(path)
+            # 내용이 같은 파일은 이미 변환해 둔 결과를 사용
+            frame = load_frame(workbook_cache_key(content_hash))
+            if frame is None:
+                frame = self.parse(path)
+                try:
+                    save_frame(workbook_cache_key(content_hash), frame)
+                except Exception:
+                    # Parquet으로 저장할 수 없는 값이 있으면 캐시 없이 사용
+                    pass
+            return frame, content_hash
+        finally:
+            os.remove(path)
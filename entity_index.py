@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aho_corasick import AhoCorasick
+
+ENTITY_SEPARATOR = "|"
+
+# --- 기본 사전 (기업/인물 ID → 이름과 다른 표기) ---
+# NEWS_ENTITY_FILE 환경 변수에 같은 형식의 JSON 파일 경로를 지정하면 그 사전을 사용
+DEFAULT_ENTITIES = [
+    {"id": "sk_inc", "name": "SK㈜", "type": "company", "aliases": ["SK㈜", "SK(주)", "SK주식회사", "SK Inc"]},
+    {"id": "sk_networks", "name": "SK네트웍스", "type": "company", "aliases": ["SK네트웍스", "SK Networks"]},
+    {"id": "sk_hynix", "name": "SK하이닉스", "type": "company", "aliases": ["SK하이닉스", "SK hynix", "하이닉스"]},
+    {"id": "sk_telecom", "name": "SK텔레콤", "type": "company", "aliases": ["SK텔레콤", "SKT", "SK Telecom"]},
+    {"id": "sk_innovation", "name": "SK이노베이션", "type": "company", "aliases": ["SK이노베이션", "SK innovation"]},
+    {"id": "sk_on", "name": "SK온", "type": "company", "aliases": ["SK온", "SK On"]},
+    {"id": "sk_square", "name": "SK스퀘어", "type": "company", "aliases": ["SK스퀘어", "SK square"]},
+    {"id": "sk_broadband", "name": "SK브로드밴드", "type": "company", "aliases": ["SK브로드밴드", "SK broadband"]},
+    {"id": "skc", "name": "SKC", "type": "company", "aliases": ["SKC"]},
+    {"id": "sk_chemicals", "name": "SK케미칼", "type": "company", "aliases": ["SK케미칼", "SK chemicals"]},
+    {"id": "sk_biopharm", "name": "SK바이오팜", "type": "company", "aliases": ["SK바이오팜", "SK biopharm"]},
+    {"id": "sk_bioscience", "name": "SK바이오사이언스", "type": "company", "aliases": ["SK바이오사이언스", "SK bioscience"]},
+    {"id": "sk_ecoplant", "name": "SK에코플랜트", "type": "company", "aliases": ["SK에코플랜트", "SK ecoplant"]},
+    {"id": "sk_es", "name": "SK E&S", "type": "company", "aliases": ["SK E&S", "SK이엔에스"]},
+    {"id": "sk_siltron", "name": "SK실트론", "type": "company", "aliases": ["SK실트론", "SK siltron"]},
+    {"id": "sk_gas", "name": "SK가스", "type": "company", "aliases": ["SK가스", "SK gas"]},
+    {"id": "sk_magic", "name": "SK매직", "type": "company", "aliases": ["SK매직", "SK magic"]},
+    {"id": "sk_rentacar", "name": "SK렌터카", "type": "company", "aliases": ["SK렌터카", "SK rent a car"]},
+    {"id": "sk_group", "name": "SK그룹", "type": "company", "aliases": ["SK그룹", "SK group"]},
+    {"id": "chey_tae_won", "name": "최태원", "type": "person", "aliases": ["최태원"]},
+    {"id": "chey_jae_won", "name": "최재원", "type": "person", "aliases": ["최재원"]},
+    {"id": "chey_chang_won", "name": "최창원", "type": "person", "aliases": ["최창원"]},
+]
+
+
+def load_entities(path=None):
+    path = path or os.environ.get("NEWS_ENTITY_FILE")
+    if not path:
+        return DEFAULT_ENTITIES
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# --- 개체명 사전을 하나의 Aho–Corasick 자동자로 만들어 기사마다 한 번 훑음 ---
+class EntityTagger:
+    def __init__(self, entities=None):
+        self.entities = {e["id"]: e for e in (entities if entities is not None else load_entities())}
+        self._alias_entity = []
+        aliases = []
+        for entity in self.entities.values():
+            for alias in dict.fromkeys([entity["name"]] + list(entity.get("aliases", []))):
+                aliases.append(alias)
+                self._alias_entity.append(entity["id"])
+        self._automaton = AhoCorasick(aliases)
+
+    def find(self, text):
+        """텍스트에 나온 개체 ID 목록 (처음 나온 순서, 중복 없음)."""
+        if not isinstance(text, str) or not text:
+            return []
+        return list(dict.fromkeys(self._alias_entity[m[2]] for m in self._automaton.find_longest(text)))
+
+    def tag(self, df):
+        """entities 컬럼("sk_networks|chey_tae_won" 형식)을 추가한 사본을 반환."""
+        df = df.copy()
+        title = df["title"].fillna("").astype(str)
+        summary = df["summary"].fillna("").astype(str)
+        tags = [ENTITY_SEPARATOR.join(self.find(t + "\n" + s)) for t, s in zip(title, summary)]
+        df["entities"] = pd.array(tags, dtype="string").fillna("")
+        return df
+
+
+# --- 한 데이터셋 버전의 개체 ID → 기사 행 번호 목록 (만든 뒤에는 바뀌지 않음) ---
+class EntityPostings:
+    def __init__(self, postings):
+        self._postings = postings
+
+    def rows(self, entity_ids):
+        """선택한 개체 중 하나라도 언급한 기사의 행 번호 (정렬됨)."""
+        arrays = [self._postings[e] for e in entity_ids if e in self._postings]
+        if not arrays:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(arrays))
+
+    def counts(self):
+        return {entity_id: len(rows) for entity_id, rows in self._postings.items()}
+
+
+# --- 데이터셋 버전별 색인 (entities 컬럼에서 버전마다 한 번 생성) ---
+class EntityIndex:
+    """column: "a|b" 형식의 태그 컬럼 (워치리스트 단어 컬럼에도 사용).
+
+    행 번호는 버전마다 다르므로 sync()가 돌려준 EntityPostings를 그 실행(rerun) 동안 사용.
+    다른 세션이 새 버전으로 갱신해도 이전 버전을 보던 세션의 색인은 바뀌지 않음.
+    """
+
+    KEEP_VERSIONS = 2
+
+    def __init__(self, column="entities"):
+        self.column = column
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def sync(self, df, version=None):
+        with self._lock:
+            postings = self._versions.get(version) if version is not None else None
+        if postings is not None:
+            return postings
+        rows = {}
+        for position, tags in enumerate(df[self.column].tolist()):
+            if tags:
+                for entity_id in tags.split(ENTITY_SEPARATOR):
+                    rows.setdefault(entity_id, []).append(position)
+        postings = EntityPostings({entity_id: np.array(r, dtype=np.int64) for entity_id, r in rows.items()})
+        if version is not None:
+            with self._lock:
+                postings = self._versions.setdefault(version, postings)
+                # 오래된 버전부터 버림 (그 버전을 쓰던 실행은 자기 객체를 계속 가지고 있음)
+                while len(self._versions) > self.KEEP_VERSIONS:
+                    del self._versions[next(iter(self._versions))]
+        return postings
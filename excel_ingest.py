@@ -0,0 +1,86 @@
+import hashlib
+import io
+
+import openpyxl
+import pandas as pd
+
+from frame_cache import load_frame, save_frame
+from news_data import parse_dates
+
+CHUNK_ROWS = 5000
+# 값이 몇 가지뿐인 컬럼은 category 타입으로 저장
+CATEGORY_COLUMNS = {"theme", "category", "source"}
+DATE_COLUMNS = {"date"}
+
+
+def _type_chunk(header, rows):
+    df = pd.DataFrame.from_records(rows, columns=header)
+    # 모든 칸이 비어 있는 행은 버림
+    df = df.dropna(how="all")
+    for column in df.columns:
+        if column in DATE_COLUMNS:
+            # 시트 형식("Mon, 14 Jul")의 문자열은 연도를 붙여서 해석 (그냥 변환하면 1년으로 잘못 읽힘)
+            df[column] = parse_dates(df[column])
+        elif pd.api.types.infer_dtype(df[column], skipna=True) in ("string", "empty"):
+            df[column] = df[column].astype("string").str.strip()
+    return df
+
+
+# --- 읽기 전용 모드로 행을 순서대로 읽어 일정 크기씩 변환 (전체 문서를 메모리에 올리지 않음) ---
+def iter_workbook_chunks(source, sheet=None, chunk_rows=CHUNK_ROWS):
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        header = [str(h).strip() if h is not None else f"column_{i}" for i, h in enumerate(header_row)]
+        chunk = []
+        for row in rows:
+            chunk.append(row[:len(header)])
+            if len(chunk) >= chunk_rows:
+                yield _type_chunk(header, chunk)
+                chunk = []
+        if chunk:
+            yield _type_chunk(header, chunk)
+    finally:
+        workbook.close()
+
+
+def read_workbook(source, required_columns=(), sheet=None, chunk_rows=CHUNK_ROWS):
+    frames = []
+    for chunk in iter_workbook_chunks(source, sheet, chunk_rows):
+        missing = set(required_columns) - set(chunk.columns)
+        if missing:
+            raise ValueError(f"필수 컬럼 누락: {missing}")
+        frames.append(chunk)
+    if not frames:
+        return pd.DataFrame(columns=list(required_columns))
+    df = pd.concat(frames, ignore_index=True)
+    # 조각마다 다른 category 목록이 생기지 않도록 합친 뒤에 변환
+    for column in CATEGORY_COLUMNS & set(df.columns):
+        df[column] = df[column].astype("category")
+    return df
+
+
+# --- 업로드된 파일 내용의 해시로 변환 결과를 캐시 (재실행/다른 세션에서 재사용) ---
+def workbook_cache_key(content_hash, sheet=None):
+    return f"xlsx-{content_hash}" if not sheet else f"xlsx-{content_hash}-{hashlib.sha1(sheet.encode()).hexdigest()[:8]}"
+
+
+def load_uploaded_workbook(data, required_columns=(), sheet=None):
+    cache_key = workbook_cache_key(hashlib.sha256(data).hexdigest(), sheet)
+    df = load_frame(cache_key)
+    if df is not None:
+        missing = set(required_columns) - set(df.columns)
+        if missing:
+            raise ValueError(f"필수 컬럼 누락: {missing}")
+        return df
+    df = read_workbook(io.BytesIO(data), required_columns, sheet)
+    try:
+        save_frame(cache_key, df)
+    except Exception:
+        # Parquet으로 저장할 수 없는 값이 있으면 캐시 없이 사용
+        pass
+    return df
@@ -0,0 +1,233 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from kv_cache import CACHE_DIR
+
+LIKE = 1
+DISLIKE = -1
+NO_VOTE = 0
+
+
+def _vote_delta(old, new):
+    # (좋아요 증감, 싫어요 증감)
+    return (new == LIKE) - (old == LIKE), (new == DISLIKE) - (old == DISLIKE)
+
+
+# --- 주간/월간 집계 구간 (화면의 "{월}월 {주}주차" 표기와 같은 기준) ---
+def week_of_month(dt):
+    return (dt.day - 1) // 7 + 1
+
+
+def week_key(dt):
+    return f"week:{dt.year}-{dt.month:02d}-{week_of_month(dt)}"
+
+
+def month_key(dt):
+    return f"month:{dt.year}-{dt.month:02d}"
+
+
+def period_keys(timestamp):
+    dt = datetime.fromtimestamp(timestamp)
+    return week_key(dt), month_key(dt)
+
+
+def _add_delta(deltas, key, like_delta, dislike_delta):
+    if like_delta or dislike_delta:
+        delta = deltas.setdefault(key, [0, 0])
+        delta[0] += like_delta
+        delta[1] += dislike_delta
+
+
+# --- 좋아요/싫어요 저장소 (모든 세션이 공유, 투표는 모아서 한 번에 기록) ---
+class FeedbackStore:
+    def __init__(self, path=None, flush_interval=2.0, max_pending=200):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "feedback.sqlite3")
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # 버퍼와 DB 접근을 하나의 락으로 묶어 기록 도중에도 읽기 결과가 일관되게 함
+        self._lock = threading.RLock()
+        self._pending_votes = {}    # (session_id, article_id) -> (vote, 투표 시각)
+        self._pending_deltas = {}   # article_id -> [좋아요 증감, 싫어요 증감]
+        self._pending_period_deltas = {}  # (period, article_id) -> [좋아요 증감, 싫어요 증감]
+        self._wake = threading.Event()
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS votes (
+                session_id TEXT NOT NULL,
+                article_id TEXT NOT NULL,
+                vote INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (session_id, article_id)
+            );
+            CREATE TABLE IF NOT EXISTS article_scores (
+                article_id TEXT PRIMARY KEY,
+                likes INTEGER NOT NULL DEFAULT 0,
+                dislikes INTEGER NOT NULL DEFAULT 0,
+                score INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_article_scores_score ON article_scores (score DESC);
+            CREATE TABLE IF NOT EXISTS period_scores (
+                period TEXT NOT NULL,
+                article_id TEXT NOT NULL,
+                likes INTEGER NOT NULL DEFAULT 0,
+                dislikes INTEGER NOT NULL DEFAULT 0,
+                score INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (period, article_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_period_scores_score ON period_scores (period, score DESC);
+        """)
+        self._conn.commit()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="feedback-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    # --- 쓰기 ---
+    def _current_vote(self, session_id, article_id):
+        key = (session_id, article_id)
+        if key in self._pending_votes:
+            return self._pending_votes[key]
+        row = self._conn.execute(
+            "SELECT vote, updated_at FROM votes WHERE session_id = ? AND article_id = ?", key
+        ).fetchone()
+        return tuple(row) if row else (NO_VOTE, None)
+
+    def record_vote(self, session_id, article_id, vote, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            old, voted_at = self._current_vote(session_id, article_id)
+            if old == vote:
+                return
+            self._pending_votes[(session_id, article_id)] = (vote, now)
+            _add_delta(self._pending_deltas, article_id, *_vote_delta(old, vote))
+            # 주간/월간 점수는 투표한 시점의 구간에 반영 (취소는 원래 투표한 구간에서 차감)
+            if old != NO_VOTE:
+                for period in period_keys(voted_at):
+                    _add_delta(self._pending_period_deltas, (period, article_id), *_vote_delta(old, NO_VOTE))
+            if vote != NO_VOTE:
+                for period in period_keys(now):
+                    _add_delta(self._pending_period_deltas, (period, article_id), *_vote_delta(NO_VOTE, vote))
+            if len(self._pending_votes) >= self.max_pending:
+                self._wake.set()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # 다음 주기에 다시 시도
+                pass
+
+    def flush(self):
+        with self._lock:
+            if not self._pending_votes:
+                return
+            votes, deltas = self._pending_votes, self._pending_deltas
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM votes WHERE session_id = ? AND article_id = ?",
+                    [key for key, (vote, _) in votes.items() if vote == NO_VOTE],
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO votes (session_id, article_id, vote, updated_at) VALUES (?, ?, ?, ?)",
+                    [(s, a, vote, voted_at) for (s, a), (vote, voted_at) in votes.items() if vote != NO_VOTE],
+                )
+                self._conn.executemany(
+                    "INSERT INTO article_scores (article_id, likes, dislikes, score) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(article_id) DO UPDATE SET "
+                    "likes = likes + excluded.likes, dislikes = dislikes + excluded.dislikes, "
+                    "score = score + excluded.score",
+                    [(a, dl, dd, dl - dd) for a, (dl, dd) in deltas.items() if dl or dd],
+                )
+                self._conn.executemany(
+                    "INSERT INTO period_scores (period, article_id, likes, dislikes, score) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(period, article_id) DO UPDATE SET "
+                    "likes = likes + excluded.likes, dislikes = dislikes + excluded.dislikes, "
+                    "score = score + excluded.score",
+                    [(p, a, dl, dd, dl - dd) for (p, a), (dl, dd) in self._pending_period_deltas.items() if dl or dd],
+                )
+            # 기록에 성공한 경우에만 버퍼를 비움 (실패하면 다음 주기에 다시 시도)
+            self._pending_votes, self._pending_deltas, self._pending_period_deltas = {}, {}, {}
+
+    # --- 읽기 (아직 기록되지 않은 투표도 반영) ---
+    def session_votes(self, session_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT article_id, vote FROM votes WHERE session_id = ?", (session_id,)
+            ).fetchall()
+            votes = dict(rows)
+            for (s, article_id), (vote, _) in self._pending_votes.items():
+                if s == session_id:
+                    votes[article_id] = vote
+        return {article_id: vote for article_id, vote in votes.items() if vote != NO_VOTE}
+
+    def _pending_for(self, period):
+        if period is None:
+            return self._pending_deltas
+        return {a: delta for (p, a), delta in self._pending_period_deltas.items() if p == period}
+
+    def _apply_pending(self, counts, period=None):
+        with self._lock:
+            for article_id, (dl, dd) in self._pending_for(period).items():
+                if article_id in counts:
+                    likes, dislikes = counts[article_id]
+                    counts[article_id] = (likes + dl, dislikes + dd)
+        return counts
+
+    def _stored_counts(self, article_ids, period=None):
+        article_ids = list(dict.fromkeys(article_ids))
+        counts = {article_id: (0, 0) for article_id in article_ids}
+        if period is None:
+            query, params = "SELECT article_id, likes, dislikes FROM article_scores WHERE ", []
+        else:
+            query, params = "SELECT article_id, likes, dislikes FROM period_scores WHERE period = ? AND ", [period]
+        with self._lock:
+            for i in range(0, len(article_ids), 500):
+                chunk = article_ids[i:i + 500]
+                rows = self._conn.execute(
+                    f"{query}article_id IN ({','.join('?' * len(chunk))})", params + chunk
+                ).fetchall()
+                for article_id, likes, dislikes in rows:
+                    counts[article_id] = (likes, dislikes)
+        return counts
+
+    def counts(self, article_ids, period=None):
+        return self._apply_pending(self._stored_counts(article_ids, period), period)
+
+    # period를 주면 해당 주/월의 점수표에서, 없으면 전체 기간 점수표에서 상위 k개를 읽음
+    def top_k(self, k=5, period=None):
+        with self._lock:
+            pending_ids = list(self._pending_for(period))
+            if period is None:
+                rows = self._conn.execute(
+                    "SELECT article_id, likes, dislikes FROM article_scores "
+                    "WHERE score != 0 ORDER BY score DESC LIMIT ?", (k + len(pending_ids),)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT article_id, likes, dislikes FROM period_scores "
+                    "WHERE period = ? AND score != 0 ORDER BY score DESC LIMIT ?",
+                    (period, k + len(pending_ids))
+                ).fetchall()
+            counts = {article_id: (likes, dislikes) for article_id, likes, dislikes in rows}
+            counts.update(self._stored_counts([a for a in pending_ids if a not in counts], period))
+            counts = self._apply_pending(counts, period)
+        ranked = [
+            (article_id, likes, dislikes, likes - dislikes)
+            for article_id, (likes, dislikes) in counts.items()
+            if likes != dislikes
+        ]
+        ranked.sort(key=lambda item: item[3], reverse=True)
+        return ranked[:k]
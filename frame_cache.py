@@ -0,0 +1,26 @@
+import os
+
+import pandas as pd
+
+from kv_cache import CACHE_DIR
+
+
+# --- 변환된 데이터프레임을 내용 해시 이름의 Parquet 파일로 저장 (세션/프로세스 간 재사용) ---
+def _path(key, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, "frames", f"{key}.parquet")
+
+
+def load_frame(key, cache_dir=None):
+    try:
+        return pd.read_parquet(_path(key, cache_dir))
+    except (OSError, ValueError):
+        return None
+
+
+def save_frame(key, df, cache_dir=None):
+    path = _path(key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return path
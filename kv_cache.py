@@ -0,0 +1,77 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- 캐시 저장 위치 (여러 세션/프로세스가 같은 파일을 공유) ---
+CACHE_DIR = os.environ.get("NEWS_CACHE_DIR", ".news_cache")
+
+# SQLite IN 절에 넣을 수 있는 파라미터 수 제한을 피하기 위한 묶음 크기
+BATCH_SIZE = 500
+
+
+class KVCache:
+    """SQLite 파일 하나에 JSON 값을 저장하는 키-값 캐시 (ttl 초가 지나면 만료)."""
+
+    def __init__(self, name, ttl=None, cache_dir=None):
+        cache_dir = cache_dir or CACHE_DIR
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{name}.sqlite3")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _encode(self, value):
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def _decode(self, blob):
+        return json.loads(blob)
+
+    def _is_fresh(self, updated_at):
+        return self.ttl is None or time.time() - updated_at < self.ttl
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys):
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), BATCH_SIZE):
+                chunk = keys[i:i + BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, updated_at FROM kv WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob, updated_at in rows:
+                    if self._is_fresh(updated_at):
+                        found[key] = self._decode(blob)
+        return found
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items):
+        now = time.time()
+        rows = [(key, self._encode(value), now) for key, value in items.items()]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO kv (key, value, updated_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        if self.ttl is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE updated_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
@@ -0,0 +1,164 @@
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from link_preview import USER_AGENT
+from news_data import REDIRECTOR_PARAMS, canonicalize_url
+
+LINK_OK = "ok"
+LINK_DEAD = "dead"
+LINK_UNKNOWN = "unknown"
+# 다시 확인하기까지의 시간 (정상 링크는 길게, 끊긴 링크는 일시적 오류일 수 있어 짧게)
+OK_RECHECK_SECONDS = 7 * 24 * 60 * 60
+DEAD_RECHECK_SECONDS = 24 * 60 * 60
+# 이 상태 코드만 끊긴 링크로 봄 (403/429 등은 봇 차단일 수 있음)
+DEAD_STATUS_CODES = {404, 410}
+# 접속 자체가 안 되는 상태(DNS 오류, 연결 거부, 5xx 등)가 이 횟수 이상, 이 기간 넘게 이어져야 끊긴 링크로 봄
+DEAD_AFTER_FAILURES = 3
+DEAD_AFTER_SECONDS = 3 * 24 * 60 * 60
+# 리디렉션된 최종 주소로 바꿔도 되는 단축 주소/중계 서비스 (일반 기사 사이트의 리디렉션은 동의 화면·로그인 등일 수 있음)
+SHORTENER_HOSTS = {
+    "bit.ly", "t.co", "goo.gl", "tinyurl.com", "ow.ly", "buff.ly", "dlvr.it", "lnkd.in", "is.gd",
+    "naver.me", "me2.do", "han.gl", "url.kr", "vo.la", "t.ly",
+} | {key.partition("/")[0] for key in REDIRECTOR_PARAMS}
+# 최종 주소가 이런 경로면 기사가 아니라 로그인/동의/봇 확인 화면으로 봄
+NON_ARTICLE_PATH_WORDS = ("login", "signin", "sign-in", "consent", "captcha", "challenge", "sorry")
+
+
+def _host(url):
+    host = urllib.parse.urlsplit(url).netloc.lower().rpartition("@")[2].partition(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def _is_article_url(url):
+    path = urllib.parse.urlsplit(url).path.strip("/").lower()
+    return bool(path) and not any(word in path for word in NON_ARTICLE_PATH_WORDS)
+
+
+def resolved_url(url, final_url):
+    """단축 주소/중계 링크가 실제 기사 경로로 이어진 경우에만 그 주소를, 아니면 원래 주소를 반환."""
+    if not final_url or final_url == url or _host(url) not in SHORTENER_HOSTS:
+        return url
+    if _host(final_url) in SHORTENER_HOSTS or not _is_article_url(final_url):
+        return url
+    # 실제 기사 주소의 추적 파라미터는 다시 제거
+    return canonicalize_url(final_url)
+
+
+def _is_failure(result):
+    """응답을 받지 못했거나 서버 오류(5xx)인 결과. 403/429 같은 차단 응답은 실패로 세지 않음."""
+    status = result.get("status")
+    return result.get("state") == LINK_UNKNOWN and (status is None or status >= 500)
+
+
+def check_link(url, timeout=5):
+    """HEAD 요청(허용하지 않으면 GET)으로 상태 확인. 리디렉션은 따라가서 최종 주소를 기록."""
+    result = {"checked_at": time.time()}
+    for method in ("HEAD", "GET"):
+        request = urllib.request.Request(url, method=method, headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                result.update(status=response.status, final_url=response.geturl(), state=LINK_OK)
+                return result
+        except urllib.error.HTTPError as e:
+            if method == "HEAD" and e.code in (403, 405, 501):
+                continue
+            result.update(status=e.code, state=LINK_DEAD if e.code in DEAD_STATUS_CODES else LINK_UNKNOWN)
+            return result
+        except urllib.error.URLError as e:
+            # DNS 오류도 일시적일 수 있어 한 번으로는 알 수 없음 (반복되면 LinkHealthChecker가 판단)
+            result.update(error=str(e.reason), state=LINK_UNKNOWN)
+            return result
+        except Exception as e:
+            result.update(error=str(e), state=LINK_UNKNOWN)
+            return result
+    return result
+
+
+# --- 링크 상태 확인 (URL별 결과를 캐시, 정해진 시간 안에 끝난 것만 이번 갱신에 반영) ---
+class LinkHealthChecker:
+    def __init__(self, cache, max_workers=16, timeout=5, check=check_link):
+        self.cache = cache
+        self.timeout = timeout
+        self._check = check
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="link-health")
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def _is_fresh(self, result, now):
+        max_age = OK_RECHECK_SECONDS if result.get("state") == LINK_OK else DEAD_RECHECK_SECONDS
+        return now - result.get("checked_at", 0) < max_age
+
+    def _track_failures(self, url, result):
+        """연속 실패 횟수와 처음 실패한 시각을 이어서 기록하고, 오래 이어졌으면 끊긴 링크로 표시."""
+        if not _is_failure(result):
+            return result
+        previous = self.cache.get(url) or {}
+        if previous.get("failures"):
+            result.update(failures=previous["failures"] + 1, first_failed_at=previous["first_failed_at"])
+        else:
+            result.update(failures=1, first_failed_at=result["checked_at"])
+        lasted = result["checked_at"] - result["first_failed_at"]
+        if result["failures"] >= DEAD_AFTER_FAILURES and lasted >= DEAD_AFTER_SECONDS:
+            result["state"] = LINK_DEAD
+        return result
+
+    def _check_and_store(self, url):
+        try:
+            result = self._track_failures(url, self._check(url, timeout=self.timeout))
+            self.cache.set(url, result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(url, None)
+
+    def check_many(self, urls, wait_seconds=5):
+        """{URL: 결과}. wait_seconds 안에 확인하지 못한 URL은 빠지고, 확인은 백그라운드에서 계속됨."""
+        urls = [u for u in dict.fromkeys(urls) if u]
+        results = self.cache.get_many(urls)
+        now = time.time()
+        stale = [u for u in urls if u not in results or not self._is_fresh(results[u], now)]
+        futures = {}
+        with self._lock:
+            for url in stale:
+                future = self._in_flight.get(url)
+                if future is None:
+                    future = self._in_flight[url] = self._executor.submit(self._check_and_store, url)
+                futures[url] = future
+        if futures:
+            wait(futures.values(), timeout=wait_seconds)
+            for url, future in futures.items():
+                if future.done() and future.exception() is None:
+                    results[url] = future.result()
+        return results
+
+
+# --- 수집 단계: 단축 주소는 실제 기사 주소로 교체하고 링크 상태(link_status) 컬럼 추가 ---
+# 단축 주소가 가리키는 기사가 원래 주소로도 들어와 있으면 단축 주소 쪽 행을 뺌
+# (단축 주소끼리 같은 곳으로 이어진 경우는 서로 다른 기사가 같은 화면으로 리디렉션된 것일 수 있어 합치지 않음)
+def apply_link_health(df, checker, drop_dead=False, wait_seconds=5):
+    df = df.copy()
+    urls = df["url"].dropna()
+    results = checker.check_many(urls.tolist(), wait_seconds=wait_seconds)
+    status = pd.Series(LINK_UNKNOWN, index=df.index, dtype="string")
+    resolved = df["url"].astype("string")
+    for idx, url in urls.items():
+        result = results.get(url)
+        if result is None:
+            continue
+        status[idx] = result.get("state", LINK_UNKNOWN)
+        resolved[idx] = resolved_url(url, result.get("final_url"))
+    direct_urls = set(urls[[_host(url) not in SHORTENER_HOSTS for url in urls]])
+    resolved_urls = resolved[urls.index]
+    duplicate = (resolved_urls != urls.astype("string")) & resolved_urls.isin(direct_urls)
+    df["url"] = resolved.astype(df["url"].dtype)
+    df["link_status"] = status.astype("category")
+    df = df.drop(index=duplicate.index[duplicate.to_numpy()])
+    if drop_dead:
+        df = df[df["link_status"] != LINK_DEAD]
+    return df
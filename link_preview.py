@@ -0,0 +1,159 @@
+import html
+import re
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+
+# --- 미리보기 수집 설정 ---
+USER_AGENT = "Mozilla/5.0 (compatible; SKTodayPreview/1.0)"
+MAX_HEAD_BYTES = 256 * 1024   # <head> 메타 정보만 필요하므로 앞부분만 읽음
+MAX_DESCRIPTION_CHARS = 200
+FAILURE_RETRY_SECONDS = 60 * 60  # 실패한 URL은 1시간 뒤에 다시 시도
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+
+class _MetaParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ""
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            attrs = dict(attrs)
+            key = (attrs.get("property") or attrs.get("name") or "").lower()
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"].strip()
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            # 본문은 필요 없으므로 여기서 파싱 종료
+            raise _HeadFinished()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+class _HeadFinished(Exception):
+    pass
+
+
+def decode_html(raw, content_type):
+    charset = None
+    match = re.search(r"charset=([\w-]+)", content_type or "", re.I)
+    if match:
+        charset = match.group(1)
+    else:
+        match = _CHARSET_RE.search(raw[:4096])
+        if match:
+            charset = match.group(1).decode("ascii", "ignore")
+    try:
+        return raw.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def parse_preview(page_html):
+    parser = _MetaParser()
+    try:
+        parser.feed(page_html)
+        parser.close()
+    except _HeadFinished:
+        pass
+    meta = parser.meta
+    description = meta.get("og:description") or meta.get("description") or ""
+    if len(description) > MAX_DESCRIPTION_CHARS:
+        description = description[:MAX_DESCRIPTION_CHARS].rstrip() + "…"
+    return {
+        "title": meta.get("og:title") or parser.title.strip(),
+        "description": description,
+        "image": meta.get("og:image", ""),
+        "site_name": meta.get("og:site_name", ""),
+    }
+
+
+def fetch_preview(url, timeout=5):
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            raw = response.read(MAX_HEAD_BYTES)
+            card = parse_preview(decode_html(raw, response.headers.get("Content-Type")))
+    except Exception as e:
+        return {"failed": True, "error": str(e), "fetched_at": time.time()}
+    card["fetched_at"] = time.time()
+    return card
+
+
+# --- 미리보기 카드 서비스 (URL 당 한 번만 가져오고 결과는 캐시에 저장) ---
+class LinkPreviewService:
+    def __init__(self, cache, max_workers=8, timeout=5, fetch=fetch_preview):
+        self.cache = cache
+        self.timeout = timeout
+        self._fetch = fetch
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preview")
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _fetch_and_store(self, url):
+        try:
+            card = self._fetch(url, timeout=self.timeout)
+            self.cache.set(url, card)
+            return card
+        finally:
+            with self._lock:
+                self._in_flight.pop(url, None)
+
+    def _submit(self, url):
+        # 다른 세션이 이미 같은 URL을 가져오는 중이면 그 결과를 함께 기다림
+        with self._lock:
+            future = self._in_flight.get(url)
+            if future is None:
+                future = self._executor.submit(self._fetch_and_store, url)
+                self._in_flight[url] = future
+            return future
+
+    def get_previews(self, urls, wait_seconds=0):
+        """캐시된 카드를 바로 반환. 없는 URL은 백그라운드로 가져오고 다음 실행부터 표시 (wait_seconds만큼은 기다림)."""
+        urls = [u for u in dict.fromkeys(urls) if u]
+        cards = self.cache.get_many(urls)
+        now = time.time()
+        missing = [
+            u for u in urls
+            if u not in cards
+            or (cards[u].get("failed") and now - cards[u].get("fetched_at", 0) > FAILURE_RETRY_SECONDS)
+        ]
+        if missing:
+            futures = {url: self._submit(url) for url in missing}
+            if wait_seconds:
+                wait(futures.values(), timeout=wait_seconds)
+            for url, future in futures.items():
+                if future.done() and future.exception() is None:
+                    cards[url] = future.result()
+        return cards
+
+
+def render_preview_card(card, url):
+    if not card or card.get("failed") or not (card.get("title") or card.get("description")):
+        return ""
+    image_html = ""
+    if card.get("image"):
+        image_html = f'<img src="{html.escape(card["image"], quote=True)}" loading="lazy">'
+    site = card.get("site_name") or urllib.parse.urlparse(url).netloc
+    return (
+        f'<a class="preview-card" href="{html.escape(url, quote=True)}" target="_blank">'
+        f"{image_html}"
+        f'<div><div class="preview-card-site">{html.escape(site)}</div>'
+        f'<div class="preview-card-title">{html.escape(card.get("title", ""))}</div>'
+        f'<div class="preview-card-desc">{html.escape(card.get("description", ""))}</div></div>'
+        f"</a>"
+    )
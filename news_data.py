@@ -0,0 +1,163 @@
+import hashlib
+import urllib.parse
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+ARTICLE_ID_LENGTH = 12
+SHEET_DATE_YEAR = 2025
+
+
+# --- 시트의 날짜 문자열("Mon, 14 Jul") 변환 (연도는 시트에 없으므로 붙여서 변환) ---
+def parse_sheet_dates(series, year=SHEET_DATE_YEAR):
+    return pd.to_datetime(series.astype("string").str.strip('"') + f" {year}", format="%a, %d %b %Y")
+
+
+# --- URL 정리 (추적용 파라미터 제거, 알려진 중계 링크는 원래 주소로) ---
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_hsenc", "_hsmi"}
+TRACKING_PREFIXES = ("utm_",)
+# 중계 주소 → 원래 주소가 들어 있는 파라미터 이름 (네트워크 없이 풀 수 있는 것만)
+REDIRECTOR_PARAMS = {
+    "www.google.com/url": ("q", "url"),
+    "google.com/url": ("q", "url"),
+    "l.facebook.com/l.php": ("u",),
+    "lm.facebook.com/l.php": ("u",),
+    "out.reddit.com/": ("url",),
+    "link.naver.com/": ("url",),
+}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    if not isinstance(url, str) or not url.strip():
+        return url
+    parts = urllib.parse.urlsplit(url.strip())
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    netloc = parts.netloc.lower()
+    # 중계 링크 (여러 번 감싼 경우도 풀어 냄)
+    for key, names in REDIRECTOR_PARAMS.items():
+        host, _, path = key.partition("/")
+        if netloc == host and parts.path.lstrip("/").startswith(path):
+            target = next((value for name, value in query if name in names and value.startswith("http")), None)
+            if target:
+                return canonicalize_url(target)
+    host, _, port = netloc.rpartition(":") if ":" in netloc else (netloc, "", "")
+    if port and DEFAULT_PORTS.get(parts.scheme.lower()) == port:
+        netloc = host
+    kept = [(k, v) for k, v in query if not _is_tracking(k)]
+    # 지운 파라미터가 없으면 원래 표기(인코딩)를 그대로 둠
+    query_text = parts.query if len(kept) == len(query) else urllib.parse.urlencode(kept)
+    return urllib.parse.urlunsplit((parts.scheme.lower(), netloc, parts.path or "/", query_text, ""))
+
+
+# --- URL 정규화 (같은 기사를 가리키는 표기 차이를 없앰, 기사 ID 계산용) ---
+def normalize_url(url):
+    if not isinstance(url, str) or not url.strip():
+        return ""
+    parts = urllib.parse.urlsplit(canonicalize_url(url))
+    path = parts.path.rstrip("/") or "/"
+    # 파라미터 순서 차이도 같은 주소로 봄
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, query, ""))
+
+
+def _clean_text(value):
+    return "" if value is None or pd.isna(value) else str(value)
+
+
+def _identity_key(row):
+    url = normalize_url(row.get("url"))
+    if url:
+        return url
+    # URL이 없으면 제목+출처+날짜로 식별
+    date = row.get("date")
+    date_text = date.strftime("%Y-%m-%d") if isinstance(date, pd.Timestamp) else _clean_text(date)
+    title = " ".join(_clean_text(row.get("title")).split())
+    return f"{title}|{_clean_text(row.get('source'))}|{date_text}"
+
+
+def make_article_id(row):
+    return hashlib.sha1(_identity_key(row).encode("utf-8")).hexdigest()[:ARTICLE_ID_LENGTH]
+
+
+# --- 기사 ID 부여 (행 순서가 바뀌어도 같은 기사는 같은 ID) ---
+def assign_article_ids(df):
+    ids = [make_article_id(row) for _, row in df.iterrows()]
+    df = df.set_index(pd.Index(ids, name="article_id"))
+    # 같은 기사가 여러 행으로 들어온 경우 첫 행만 사용
+    return df[~df.index.duplicated(keep="first")]
+
+
+# --- 공통 기사 스키마로 정리 (컬럼/타입/ID를 소스와 관계없이 통일) ---
+ARTICLE_COLUMNS = ["date", "theme", "category", "title", "source", "summary", "url"]
+TEXT_COLUMNS = ["theme", "category", "title", "source", "summary", "url"]
+
+
+def parse_dates(series):
+    """시트 형식("Mon, 14 Jul", 연도 없음)과 일반 날짜 형식을 모두 datetime으로 변환."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    text = series.astype("string").str.strip('"')
+    parsed = pd.to_datetime(text + f" {SHEET_DATE_YEAR}", format="%a, %d %b %Y", errors="coerce")
+    # 시트 형식("Mon, 14 Jul")이 아닌 값은 일반적인 날짜 형식으로 변환
+    rest = parsed.isna() & text.notna()
+    if rest.any():
+        parsed[rest] = pd.to_datetime(text[rest], errors="coerce", format="mixed")
+    return parsed
+
+
+def normalize_articles(df, origin=None):
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    if "title" not in df.columns:
+        raise ValueError("필수 컬럼 누락: {'title'}")
+    for column in ARTICLE_COLUMNS:
+        if column not in df.columns:
+            df[column] = pd.NA
+    df = df[ARTICLE_COLUMNS + [c for c in df.columns if c not in ARTICLE_COLUMNS]]
+
+    df["date"] = parse_dates(df["date"])
+    for column in TEXT_COLUMNS:
+        df[column] = df[column].astype("string").str.strip().replace("", pd.NA)
+    # 카테고리가 빈 행은 테마로 채우고 표시해 둠 (수집 단계에서 분류기로 다시 채울 수 있도록)
+    df["category_origin"] = df["category"].notna().map({True: "sheet", False: "theme"}).astype("string")
+    df["category"] = df["category"].fillna(df["theme"])
+    df["url"] = df["url"].map(canonicalize_url, na_action="ignore").astype("string")
+    df = df[df["title"].notna()]
+    if origin is not None:
+        df["origin"] = origin
+    return assign_article_ids(df)
+
+
+# --- 메모리 절약형 표현 (값 종류가 적은 컬럼은 category, 긴 텍스트는 Arrow 문자열) ---
+CATEGORY_COLUMNS = ["theme", "category", "source", "origin", "category_origin"]
+ARROW_TEXT_COLUMNS = ["title", "summary", "url"]
+EPOCH = date(1970, 1, 1)
+NO_DAY = np.iinfo("int64").min
+
+
+def day_key(value):
+    # 1970-01-01부터의 일수 (날짜 범위 필터를 정수 비교로 처리)
+    if isinstance(value, pd.Timestamp):
+        value = value.date()
+    return (value - EPOCH).days
+
+
+def compact_articles(df):
+    df = df.copy()
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("string").astype("category")
+    arrow_string = pd.StringDtype("pyarrow")
+    for column in ARROW_TEXT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(arrow_string)
+    days = df["date"].to_numpy(dtype="datetime64[D]")
+    df["day"] = np.where(np.isnat(days), NO_DAY, days.astype("int64"))
+    return df
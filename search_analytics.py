@@ -0,0 +1,233 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from kv_cache import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 저장 (여러 프로세스를 띄우지 않는 환경)
+    fcntl = None
+
+# 시간 단위별 구간 키 형식
+WINDOWS = {
+    "hour": "%Y-%m-%d %H",
+    "day": "%Y-%m-%d",
+    "week": "%G-W%V",
+}
+# 이 시간 동안 검색하지 않은 세션은 중복 집계 방지용 기록을 지움
+SESSION_IDLE_SECONDS = 30 * 60
+
+
+def normalize_query(query):
+    return " ".join(str(query or "").split()).lower()
+
+
+# --- Space-Saving 상위 k 스케치 (용량 고정, 검색량과 무관하게 메모리 일정) ---
+class SpaceSaving:
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self.counts = {}   # term -> [count, error]
+
+    def offer(self, term, n=1):
+        if term in self.counts:
+            self.counts[term][0] += n
+        elif len(self.counts) < self.capacity:
+            self.counts[term] = [n, 0]
+        else:
+            # 가장 적게 센 항목을 밀어내고 그 횟수를 오차로 물려받음
+            victim = min(self.counts, key=lambda t: self.counts[t][0])
+            floor = self.counts.pop(victim)[0]
+            self.counts[term] = [floor + n, floor]
+
+    def top(self, k):
+        ranked = sorted(self.counts.items(), key=lambda item: item[1][0], reverse=True)
+        return [(term, count) for term, (count, _) in ranked[:k]]
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data.get("capacity", 200))
+        sketch.counts = {term: list(value) for term, value in data.get("counts", {}).items()}
+        return sketch
+
+
+# --- 검색어 통계 (프로세스 전체 공유, 시간 구간별 스케치를 디스크에 저장) ---
+# 여러 프로세스가 같은 파일을 쓰므로, 저장할 때 파일 잠금을 잡고 파일의 스케치에 이 프로세스의 증가분만 더함
+class SearchAnalytics:
+    def __init__(self, path=None, capacity=200, debounce_seconds=5.0, save_interval=30.0):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "search_analytics.json")
+        self.path = path
+        self.capacity = capacity
+        self.debounce_seconds = debounce_seconds
+        self._lock = threading.Lock()
+        # 파일 병합은 한 번에 하나만 (기록/조회용 _lock과 분리해 파일 입출력 동안에도 검색어를 받음)
+        self._save_lock = threading.Lock()
+        self._lock_path = f"{path}.lock"
+        self._sketches = self._read_file()   # window -> (구간 키, SpaceSaving), 마지막 병합 결과 + 이후 증가분
+        self._deltas = {}     # window -> (구간 키, {query: 마지막 저장 이후 횟수})
+        self._pending = {}    # session_id -> (query, 마지막 입력 시각)
+        self._last_logged = {}  # session_id -> (마지막으로 집계한 query, 시각)
+
+        self._saver = threading.Thread(
+            target=self._save_loop, args=(save_interval,), name="search-analytics-save", daemon=True
+        )
+        self._saver.start()
+        atexit.register(self.save)
+
+    def _bucket(self, window, now):
+        return datetime.fromtimestamp(now).strftime(WINDOWS[window])
+
+    def _sketch(self, window, now):
+        bucket = self._bucket(window, now)
+        current = self._sketches.get(window)
+        if current is None or current[0] != bucket:
+            # 새 구간이 시작되면 이전 구간의 스케치는 버림
+            current = (bucket, SpaceSaving(self.capacity))
+            self._sketches[window] = current
+        return current[1]
+
+    def _count(self, query, now):
+        for window in WINDOWS:
+            self._sketch(window, now).offer(query)
+            bucket = self._bucket(window, now)
+            delta = self._deltas.get(window)
+            if delta is None or delta[0] != bucket:
+                delta = self._deltas[window] = (bucket, {})
+            delta[1][query] = delta[1].get(query, 0) + 1
+
+    def _last_query(self, session_id):
+        last = self._last_logged.get(session_id)
+        return last[0] if last else None
+
+    def _commit_pending(self, session_id, now):
+        query, _ = self._pending.pop(session_id)
+        # 같은 세션이 같은 검색어로 다시 실행(rerun)한 경우는 세지 않음
+        if self._last_query(session_id) != query:
+            self._count(query, now)
+        self._last_logged[session_id] = (query, now)
+
+    def _commit_expired(self, now):
+        for session_id, (_, seen_at) in list(self._pending.items()):
+            if now - seen_at >= self.debounce_seconds:
+                self._commit_pending(session_id, now)
+
+    def log_query(self, session_id, query, now=None):
+        now = time.time() if now is None else now
+        query = normalize_query(query)
+        with self._lock:
+            self._commit_expired(now)
+            if not query:
+                # 검색창을 비우면 입력 중이던 검색어는 확정하고, 같은 검색어를 다시 입력하면 새로 셈
+                if session_id in self._pending:
+                    self._commit_pending(session_id, now)
+                self._last_logged.pop(session_id, None)
+                return
+            pending = self._pending.get(session_id)
+            if pending is not None:
+                pending_query, seen_at = pending
+                if pending_query == query:
+                    return
+                # 입력 중인 검색어를 고쳐 쓴 경우(접두어 관계)는 이전 입력을 세지 않고 대체
+                refining = query.startswith(pending_query) or pending_query.startswith(query)
+                if refining and now - seen_at < self.debounce_seconds:
+                    self._pending[session_id] = (query, now)
+                    return
+                self._commit_pending(session_id, now)
+            if self._last_query(session_id) != query:
+                self._pending[session_id] = (query, now)
+
+    def top(self, window, k=5, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._commit_expired(now)
+            current = self._sketches.get(window)
+            if current is None or current[0] != self._bucket(window, now):
+                return []
+            return current[1].top(k)
+
+    # --- 디스크 저장/복원 ---
+    def _read_file(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {
+            window: (bucket, SpaceSaving.from_dict(sketch))
+            for window, (bucket, sketch) in data.get("sketches", {}).items()
+            if window in WINDOWS
+        }
+
+    def _prune_sessions(self, now):
+        for session_id, (_, logged_at) in list(self._last_logged.items()):
+            if now - logged_at >= SESSION_IDLE_SECONDS and session_id not in self._pending:
+                del self._last_logged[session_id]
+
+    def _merge_into(self, sketches, deltas):
+        for window, (bucket, counts) in deltas.items():
+            current = sketches.get(window)
+            if current is None or current[0] < bucket:
+                current = sketches[window] = (bucket, SpaceSaving(self.capacity))
+            elif current[0] > bucket:
+                # 이미 다음 구간으로 넘어감
+                continue
+            for query, n in counts.items():
+                current[1].offer(query, n)
+
+    def save(self):
+        """파일 잠금 안에서 파일의 스케치에 증가분을 더해 쓰고, 다른 프로세스의 집계도 함께 읽어 옴."""
+        with self._save_lock:
+            # 증가분만 떼어 내고 바로 락을 풂 (파일 입출력 동안 log_query/top이 기다리지 않도록)
+            with self._lock:
+                now = time.time()
+                self._commit_expired(now)
+                self._prune_sessions(now)
+                deltas, self._deltas = self._deltas, {}
+            lock_file = open(self._lock_path, "a")
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                sketches = self._read_file()
+                self._merge_into(sketches, deltas)
+                if deltas:
+                    data = json.dumps({
+                        "sketches": {window: [bucket, sketch.to_dict()] for window, (bucket, sketch) in sketches.items()}
+                    }, ensure_ascii=False)
+                    tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.write(data)
+                    os.replace(tmp_path, self.path)
+            except Exception:
+                # 기록하지 못한 증가분은 다음 저장 때 다시 시도
+                with self._lock:
+                    pending, self._deltas = self._deltas, deltas
+                    for window, (bucket, counts) in pending.items():
+                        delta = self._deltas.get(window)
+                        if delta is None or delta[0] != bucket:
+                            self._deltas[window] = (bucket, dict(counts))
+                        else:
+                            for query, n in counts.items():
+                                delta[1][query] = delta[1].get(query, 0) + n
+                raise
+            finally:
+                lock_file.close()
+            with self._lock:
+                # 병합하는 동안 들어온 검색어는 아직 파일에 없으므로 화면용 스케치에만 더해 둠
+                self._merge_into(sketches, self._deltas)
+                self._sketches = sketches
+
+    def _save_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.save()
+            except OSError:
+                pass
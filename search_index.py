@@ -0,0 +1,40 @@
+import threading
+
+from text_utils import tokenize
+
+
+# --- 기사 본문 단어 색인 (단어 → 기사 ID 집합, 새로 받은 본문만 추가) ---
+class BodySearchIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._indexed = set()
+        self._synced_version = None
+
+    def sync(self, df, store, version=None):
+        """본문을 받은(body_chars > 0) 기사 중 아직 색인하지 않은 기사를 저장소에서 읽어 추가."""
+        with self._lock:
+            if version is not None and version == self._synced_version:
+                return 0
+            self._synced_version = version
+            ids = [idx for idx in df.index[df["body_chars"] > 0] if idx not in self._indexed]
+        bodies = store.get_many(ids) if ids else {}
+        with self._lock:
+            for idx, body in bodies.items():
+                for term in set(tokenize(body)):
+                    self._postings.setdefault(term, set()).add(idx)
+            self._indexed.update(bodies)
+        return len(bodies)
+
+    def search(self, query):
+        """검색어의 모든 단어가 본문에 나오는 기사 ID 집합."""
+        terms = set(tokenize(query))
+        if not terms:
+            return set()
+        with self._lock:
+            postings = sorted((self._postings.get(t, set()) for t in terms), key=len)
+            # 가장 짧은 목록부터 교집합
+            result = set(postings[0])
+            for posting in postings[1:]:
+                result &= posting
+        return result
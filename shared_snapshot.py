@@ -0,0 +1,127 @@
+import glob
+import json
+import os
+import re
+import threading
+
+import pyarrow as pa
+
+from kv_cache import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 프로세스마다 직접 갱신
+    fcntl = None
+
+KEEP_VERSIONS = 2
+_VERSION_RE = re.compile(r"\.v(\d+)\.arrow$")
+
+
+# --- 여러 Streamlit 프로세스가 함께 쓰는 데이터셋 스냅샷 ---
+# 한 프로세스(잠금을 잡은 쪽)만 데이터를 불러와 Arrow IPC 파일로 쓰고,
+# 나머지는 버전 파일을 보고 같은 파일을 읽기 전용 메모리 맵으로 엶 (프로세스를 늘려도 RAM은 한 벌)
+class SharedSnapshotStore:
+    def __init__(self, name="articles", cache_dir=None):
+        self.name = name
+        self.cache_dir = os.path.join(cache_dir or CACHE_DIR, "shared")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._version_path = os.path.join(self.cache_dir, f"{name}.version.json")
+        self._lock_path = os.path.join(self.cache_dir, f"{name}.lock")
+        self._lock_file = None
+        self._lock = threading.Lock()
+
+    def _data_path(self, version, extra=None):
+        prefix = f"{self.name}.{extra}" if extra else self.name
+        return os.path.join(self.cache_dir, f"{prefix}.v{version}.arrow")
+
+    def _write_table(self, path, frame, preserve_index=True):
+        table = pa.Table.from_pandas(frame, preserve_index=preserve_index)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # 압축하지 않아야 읽는 쪽에서 복사 없이 메모리 맵으로 사용 가능
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    # 데이터를 불러올 프로세스 선출 (잠금을 잡은 프로세스가 죽으면 OS가 풀어 줌)
+    def acquire_writer(self):
+        with self._lock:
+            if self._lock_file is not None:
+                return True
+            if fcntl is None:
+                self._lock_file = True
+                return True
+            lock_file = open(self._lock_path, "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._lock_file = lock_file
+            return True
+
+    def manifest(self):
+        try:
+            with open(self._version_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self._version_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        # 버전 파일 교체는 원자적이므로 읽는 쪽은 이전/새 버전 중 하나만 봄
+        os.replace(tmp_path, self._version_path)
+
+    def publish(self, snapshot, write_data=True):
+        """snapshot의 frame과 extras(수집 단계에서 미리 만든 집계표)를 Arrow 파일로 쓰고 버전 파일을 교체.
+
+        반환값은 새 manifest.
+        """
+        path = self._data_path(snapshot.version)
+        if write_data or not os.path.exists(path):
+            self._write_table(path, snapshot.frame)
+        extra_files = {}
+        for extra, frame in snapshot.extras.items():
+            extra_path = self._data_path(snapshot.version, extra)
+            if write_data or not os.path.exists(extra_path):
+                self._write_table(extra_path, frame, preserve_index=False)
+            extra_files[extra] = os.path.basename(extra_path)
+        manifest = {
+            "version": snapshot.version,
+            "file": os.path.basename(path),
+            "extras": extra_files,
+            "loaded_at": snapshot.loaded_at,
+            "content_hash": snapshot.content_hash,
+        }
+        self._write_manifest(manifest)
+        self._remove_old(snapshot.version)
+        return manifest
+
+    def _remove_old(self, version):
+        # 방금 교체된 이전 버전은 아직 읽는 프로세스가 있을 수 있으니 남겨 둠
+        # (이미 메모리 맵으로 연 파일은 지워져도 계속 읽을 수 있음)
+        for path in glob.glob(os.path.join(self.cache_dir, f"{self.name}.*v*.arrow")):
+            match = _VERSION_RE.search(path)
+            if match is None:
+                continue
+            if int(match.group(1)) <= version - KEEP_VERSIONS:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def load(self, manifest):
+        source = pa.memory_map(os.path.join(self.cache_dir, manifest["file"]), "r")
+        table = pa.ipc.open_file(source).read_all()
+        # split_blocks: 컬럼마다 블록을 따로 두어 같은 타입 컬럼을 한 블록으로 합치는 복사를 피함 (문자열 컬럼은 맵 위의 버퍼를 그대로 사용)
+        return table.to_pandas(split_blocks=True)
+
+    def load_extras(self, manifest):
+        """집계표는 작으므로 메모리로 읽음. 예전 버전 파일처럼 extras가 없으면 빈 dict."""
+        extras = {}
+        for extra, file in manifest.get("extras", {}).items():
+            with pa.memory_map(os.path.join(self.cache_dir, file), "r") as source:
+                extras[extra] = pa.ipc.open_file(source).read_all().to_pandas()
+        return extras
@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import gspread
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+from news_data import parse_sheet_dates
+
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+HEADER_TTL_SECONDS = 10 * 60
+HEADER_RECHECK_SECONDS = 60
+
+# 값이 몇 가지뿐인 컬럼은 category 타입으로 저장
+CATEGORY_COLUMNS = {"theme", "category", "source"}
+
+_lock = threading.Lock()
+_clients = {}
+_spreadsheets = {}
+_headers = {}
+
+
+def _credentials_info(credentials):
+    if isinstance(credentials, dict):
+        return dict(credentials)
+    credentials = str(credentials).strip()
+    if credentials.startswith("{"):
+        return json.loads(credentials)
+    with open(credentials, "r") as f:
+        return json.load(f)
+
+
+# --- 인증된 클라이언트 (서비스 계정별로 프로세스에서 한 번만 생성) ---
+def get_client(credentials):
+    info = _credentials_info(credentials)
+    key = (info.get("client_email"), info.get("private_key_id"))
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = gspread.service_account_from_dict(info, scopes=SCOPE)
+            _clients[key] = client
+        return client
+
+
+def open_spreadsheet(client, name):
+    # 이름으로 여는 것은 Drive 검색 요청이 필요하므로 결과를 재사용
+    key = (id(client), name)
+    with _lock:
+        spreadsheet = _spreadsheets.get(key)
+    if spreadsheet is None:
+        spreadsheet = client.open(name)
+        with _lock:
+            _spreadsheets[key] = spreadsheet
+    return spreadsheet
+
+
+def _quote(worksheet):
+    return "'" + worksheet.replace("'", "''") + "'!" if worksheet else ""
+
+
+def _header(spreadsheet, worksheet, max_age=HEADER_TTL_SECONDS):
+    key = (spreadsheet.id, worksheet)
+    cached = _headers.get(key)
+    if cached is not None and time.time() - cached[1] < max_age:
+        return cached[0]
+    response = spreadsheet.values_batch_get([f"{_quote(worksheet)}1:1"])
+    rows = response["valueRanges"][0].get("values", [[]])
+    header = [str(h).strip() for h in rows[0]] if rows else []
+    _headers[key] = (header, time.time())
+    return header
+
+
+def _to_frame(columns, value_ranges):
+    data = {}
+    length = max((len(v.get("values", [])) for v in value_ranges), default=0)
+    for column, value_range in zip(columns, value_ranges):
+        values = [row[0] if row else "" for row in value_range.get("values", [])]
+        values += [""] * (length - len(values))
+        series = pd.Series(values, dtype="string")
+        if column == "date":
+            series = parse_sheet_dates(series.replace("", pd.NA))
+        elif column in CATEGORY_COLUMNS:
+            series = series.replace("", pd.NA).astype("category")
+        data[column] = series
+    return pd.DataFrame(data)
+
+
+# --- 필요한 컬럼만 한 번의 batchGet 요청으로 읽기 ---
+def read_columns(spreadsheet, columns, worksheet=None, max_rows=None):
+    header = _header(spreadsheet, worksheet)
+    if not set(columns).issubset(header):
+        # 시트 구조가 바뀌었을 수 있으니 헤더를 다시 읽어 확인
+        header = _header(spreadsheet, worksheet, max_age=HEADER_RECHECK_SECONDS)
+    present = [c for c in columns if c in header]
+    if not present:
+        return pd.DataFrame(columns=list(columns))
+
+    last_row = "" if max_rows is None else str(max_rows + 1)
+    ranges = []
+    for column in present:
+        letter = rowcol_to_a1(1, header.index(column) + 1)[:-1]
+        ranges.append(f"{_quote(worksheet)}{letter}2:{letter}{last_row}")
+    response = spreadsheet.values_batch_get(
+        ranges, params={"majorDimension": "ROWS", "valueRenderOption": "FORMATTED_VALUE"}
+    )
+    return _to_frame(present, response["valueRanges"])
+
+
+def _conform(df, columns):
+    # 시트마다 빠진 컬럼이 있어도 같은 스키마가 되도록 채움
+    for column in columns:
+        if column not in df.columns:
+            df[column] = pd.Series(pd.NA, index=df.index, dtype="string")
+    return df[list(columns)]
+
+
+# --- 여러 스프레드시트/워크시트를 동시에 읽어 하나로 합침 ---
+def read_many(client, targets, columns, max_workers=4, max_rows=None):
+    """targets: (스프레드시트 이름, 워크시트 이름) 목록. (합친 데이터, 실패한 대상별 오류)를 반환."""
+    def read_one(target):
+        spreadsheet_name, worksheet = target
+        df = read_columns(open_spreadsheet(client, spreadsheet_name), columns, worksheet, max_rows)
+        df = _conform(df, columns)
+        df["origin"] = f"{spreadsheet_name}/{worksheet}" if worksheet else spreadsheet_name
+        return df
+
+    targets = list(dict.fromkeys(targets))
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+        futures = {executor.submit(read_one, target): target for target in targets}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                errors[futures[future]] = e
+
+    if not results:
+        return _conform(pd.DataFrame(), list(columns) + ["origin"]), errors
+    # 입력 순서대로 합친 뒤 시트마다 달라진 category 타입을 다시 맞춤
+    merged = pd.concat([results[t] for t in targets if t in results], ignore_index=True)
+    for column in list(CATEGORY_COLUMNS & set(merged.columns)) + ["origin"]:
+        merged[column] = merged[column].astype("category")
+    return merged, errors
@@ -0,0 +1,120 @@
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from news_data import NO_DAY
+
+# MinHash 서명 길이와 LSH 밴드 수 (밴드당 4행 → 유사도 약 0.5 이상이면 후보로 잡힘)
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.5
+# 날짜가 이만큼 넘게 떨어진 기사는 같은 소식으로 보지 않음
+MAX_DAY_GAP = 2
+# 상투적인 문구로 후보가 지나치게 많이 몰린 버킷은 건너뜀
+MAX_BUCKET_SIZE = 100
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20250714)
+_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _shingles(text, size=SHINGLE_SIZE):
+    # 띄어쓰기/문장부호 차이를 무시하도록 글자 단위 n-gram 사용
+    text = _NON_WORD.sub("", text.lower())
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signatures(texts):
+    """텍스트마다 NUM_PERM개의 MinHash 값. 내용이 없는 텍스트는 None."""
+    signatures = []
+    for text in texts:
+        shingles = _shingles(text)
+        if not shingles:
+            signatures.append(None)
+            continue
+        # crc32는 프로세스가 달라도 같은 값이므로 저장된 결과와 비교 가능
+        x = np.fromiter((zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles), dtype=np.uint64, count=len(shingles))
+        signatures.append(((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1))
+    return signatures
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _candidate_pairs(signatures):
+    rows_per_band = NUM_PERM // BANDS
+    pairs = set()
+    for band in range(BANDS):
+        buckets = {}
+        for i, signature in enumerate(signatures):
+            if signature is not None:
+                key = signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes()
+                buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            if 1 < len(members) <= MAX_BUCKET_SIZE:
+                pairs.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+    return pairs
+
+
+# --- 여러 매체의 같은 소식을 하나의 스토리로 묶음 (수집 단계에서 한 번 실행) ---
+def assign_story_clusters(df):
+    """story_id(대표 기사 ID)와 story_size(묶인 기사 수) 컬럼을 추가한 사본을 반환."""
+    df = df.copy()
+    if df.empty:
+        df["story_id"] = pd.Series(dtype="string")
+        df["story_size"] = pd.Series(dtype="int64")
+        return df
+
+    texts = (df["title"].fillna("") + " " + df["summary"].fillna("")).tolist()
+    signatures = minhash_signatures(texts)
+    days = df["day"].to_numpy() if "day" in df.columns else np.full(len(df), NO_DAY)
+
+    parent = list(range(len(df)))
+    for a, b in _candidate_pairs(signatures):
+        if days[a] != NO_DAY and days[b] != NO_DAY and abs(int(days[a]) - int(days[b])) > MAX_DAY_GAP:
+            continue
+        if np.mean(signatures[a] == signatures[b]) >= SIMILARITY_THRESHOLD:
+            parent[_find(parent, a)] = _find(parent, b)
+    roots = np.array([_find(parent, i) for i in range(len(df))])
+
+    # 대표 기사: 요약이 가장 긴 기사, 같으면 먼저 보도된 기사
+    order = pd.DataFrame({
+        "root": roots,
+        "summary_len": df["summary"].fillna("").str.len().to_numpy(),
+        "day": days,
+        "position": np.arange(len(df)),
+    }).sort_values(["root", "summary_len", "day", "position"], ascending=[True, False, True, True])
+    leaders = order.drop_duplicates("root").set_index("root")["position"]
+    df["story_id"] = pd.array(df.index[leaders.loc[roots].to_numpy()], dtype="string")
+    df["story_size"] = pd.Series(roots).map(pd.Series(roots).value_counts()).to_numpy(dtype="int64")
+    return df
+
+
+# --- 화면/프롬프트용: 필터된 기사 중 스토리마다 한 건만 남김 ---
+def collapse_stories(df):
+    """(스토리별 대표 기사만 남긴 데이터, 대표 기사 ID → 같은 스토리의 다른 기사 ID 목록)을 반환."""
+    if df.empty or "story_id" not in df.columns:
+        return df, {}
+    groups = {}
+    for idx, story_id in zip(df.index, df["story_id"].tolist()):
+        groups.setdefault(story_id, []).append(idx)
+    leaders, related = [], {}
+    for story_id, members in groups.items():
+        # 대표 기사가 필터에서 빠졌으면 남은 기사 중 첫 번째가 대표
+        leader = story_id if story_id in members else members[0]
+        leaders.append(leader)
+        others = [m for m in members if m != leader]
+        if others:
+            related[leader] = others
+    return df.loc[leaders], related
@@ -0,0 +1,120 @@
+import math
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from text_utils import tokenize
+
+SUMMARY_SENTENCES = 3
+MAX_SUMMARY_CHARS = 300
+DAMPING = 0.85
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=다\.)|\n+")
+
+
+def split_sentences(text):
+    return [s.strip() for s in _SENTENCE_END.split(text or "") if len(s.strip()) >= 10]
+
+
+# --- TextRank: 문장끼리 겹치는 단어로 그래프를 만들고 PageRank 점수가 높은 문장을 고름 ---
+def textrank_summary(text, max_sentences=SUMMARY_SENTENCES, max_chars=MAX_SUMMARY_CHARS):
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return " ".join(sentences)[:max_chars]
+    token_sets = [set(tokenize(s)) for s in sentences]
+    n = len(sentences)
+    weights = np.zeros((n, n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            overlap = len(token_sets[i] & token_sets[j])
+            if overlap and len(token_sets[i]) > 1 and len(token_sets[j]) > 1:
+                weights[i, j] = weights[j, i] = overlap / (math.log(len(token_sets[i])) + math.log(len(token_sets[j])))
+    out_weight = weights.sum(axis=1, keepdims=True)
+    transition = np.divide(weights, out_weight, out=np.zeros_like(weights), where=out_weight > 0)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(50):
+        updated = (1 - DAMPING) / n + DAMPING * transition.T @ scores
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+    # 점수가 높은 문장을 원래 순서대로 이어 붙임
+    chosen = sorted(np.argsort(-scores, kind="stable")[:max_sentences])
+    return " ".join(sentences[i] for i in chosen)[:max_chars]
+
+
+def summarize_batch(items):
+    """작업 스레드에서 실행: (기사 ID, 본문) 목록 → {기사 ID: 요약}."""
+    return {idx: textrank_summary(text) for idx, text in items}
+
+
+# --- 요약이 빈 기사를 백그라운드 스레드에서 요약 (화면 갱신은 기다리지 않음) ---
+class BackgroundSummarizer:
+    """결과는 기사 ID별로 cache(KVCache)에 저장하고, 다음 데이터 갱신 때 fill()이 채워 넣음."""
+
+    def __init__(self, cache, max_workers=2, batch_size=50, on_update=None):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        # 한 묶음의 요약이 모두 끝나면 호출 (데이터 갱신 요청 등)
+        self.on_update = on_update
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            # 기사 하나의 요약은 작은 작업이라 스레드로 충분 (서버 프로세스를 fork하면 다른 스레드가 잡고 있던 락을 물려받을 수 있음)
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="summarizer")
+        return self._executor
+
+    def fill(self, df, texts):
+        """summary가 빈 행을 저장된 요약으로 채운 사본을 반환하고, 없는 요약은 백그라운드로 요청.
+
+        texts: 요약할 본문 (get_many(기사 ID 목록) → {기사 ID: 본문}). 요청할 기사의 본문만 읽음.
+        """
+        df = df.copy()
+        missing = df.index[df["summary"].isna()]
+        origin = pd.Series("sheet", index=df.index, dtype="string")
+        origin[missing] = pd.NA
+        if len(missing):
+            stored = self.cache.get_many(missing)
+            cached = {idx: s for idx, s in stored.items() if s}
+            if cached:
+                summary = df["summary"].astype("string")
+                summary[list(cached)] = pd.Series(cached, dtype="string")
+                df["summary"] = summary.astype(df["summary"].dtype)
+                origin[list(cached)] = "auto"
+            needed = texts.get_many([idx for idx in missing if idx not in stored])
+            self._schedule([(idx, text) for idx, text in needed.items() if text])
+        df["summary_origin"] = origin.astype("category")
+        return df
+
+    def _schedule(self, items):
+        with self._lock:
+            items = [(idx, text) for idx, text in items if idx not in self._pending]
+            self._pending.update(idx for idx, _ in items)
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            future = self._get_executor().submit(summarize_batch, batch)
+            future.add_done_callback(lambda f, ids=[idx for idx, _ in batch]: self._store(f, ids))
+
+    def _store(self, future, ids):
+        try:
+            summaries = future.result()
+        except Exception:
+            summaries = {}
+        if summaries:
+            # 본문이 짧아 요약이 비는 기사도 저장해 다시 요청하지 않음
+            self.cache.set_many(summaries)
+        with self._lock:
+            self._pending.difference_update(ids)
+            finished = not self._pending
+        if finished and summaries and self.on_update is not None:
+            self.on_update()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
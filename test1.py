@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
+from excel_ingest import load_uploaded_workbook
 
 st.title("📰 오늘의 AI 뉴스")
 today = datetime.now().strftime("%Y년 %m월 %d일")
@@ -8,8 +8,17 @@ st.markdown(f"#### 📅 {today}")
 
 uploaded_file = st.file_uploader("엑셀 파일 업로드", type=["xlsx"])
 
+# 파일 내용이 같으면 이전에 변환해 둔 결과를 재사용 (재실행/다른 세션 공통)
+@st.cache_data(max_entries=8)
+def load_articles(data):
+    return load_uploaded_workbook(data, required_columns=["category", "title", "source", "summary", "url"])
+
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    try:
+        df = load_articles(uploaded_file.getvalue())
+    except ValueError as e:
+        st.error(f"❌ 엑셀 파일 읽기 실패: {e}")
+        st.stop()
     categories = sorted(df['category'].unique())
 
     for category in categories:
@@ -1,30 +1,26 @@
 import streamlit as st
 import pandas as pd
-import json
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime
+from sheets_client import get_client, open_spreadsheet, read_columns
 
 st.set_page_config(page_title="오늘의 뉴스", layout="wide")
 
 st.title("🗞️ 오늘의 뉴스")
 
-# Google 인증
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+# 화면에서 사용하는 컬럼만 읽음
+ARTICLE_COLUMNS = ["theme", "category", "title", "source", "summary", "url"]
 
-with open("credentials.json", "r") as f:
-    credentials = json.load(f)
-
-creds = ServiceAccountCredentials.from_json_keyfile_dict(credentials, scope)
-client = gspread.authorize(creds)
+# Google 인증 (credentials.json으로 프로세스당 한 번만 인증)
+@st.cache_data(ttl=60)
+def load_sheet(sheet_name):
+    client = get_client("credentials.json")
+    return read_columns(open_spreadsheet(client, sheet_name), ARTICLE_COLUMNS, worksheet="article")
 
 # 구글 시트 이름 입력 (기본값 'article')
 SHEET_NAME = st.text_input("📎 불러올 구글 스프레드시트 이름:", "article")
 
 try:
-    sheet = client.open(SHEET_NAME).worksheet("article")  # 시트 탭 이름도 'article'
-    data = sheet.get_all_records()
-    df = pd.DataFrame(data)
+    df = load_sheet(SHEET_NAME)  # 시트 탭 이름도 'article'
     st.success("✅ Google Sheet에서 데이터 불러오기 성공")
 except Exception as e:
     st.error(f"❌ 시트 불러오기 실패: {e}")
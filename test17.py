@@ -1,20 +1,18 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from sheets_client import get_client, open_spreadsheet, read_columns
 
-# --- 구글 시트 인증 및 데이터 불러오기 ---
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-credentials = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-gc = gspread.authorize(credentials)
+# 화면에서 사용하는 컬럼만 읽음
+ARTICLE_COLUMNS = ["date", "theme", "category", "title", "source", "summary", "url"]
 
-sheet = gc.open("article").sheet1
-data = sheet.get_all_records()
-df = pd.DataFrame(data)
+# --- 구글 시트 인증 및 데이터 불러오기 (인증은 프로세스당 한 번, 날짜는 읽으면서 변환) ---
+@st.cache_data(ttl=60)
+def load_sheet():
+    client = get_client("credentials.json")
+    return read_columns(open_spreadsheet(client, "article"), ARTICLE_COLUMNS)
 
-# --- 날짜 처리 ---
-df["date"] = df["date"].apply(lambda x: datetime.strptime(x.strip('"') + " 2025", "%a, %d %b %Y"))
+df = load_sheet()
 
 # --- 오늘 날짜 표시 ---
 st.title("🗞️ 오늘의 뉴스")
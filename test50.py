@@ -1,10 +1,32 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import streamlit.components.v1 as components
 import google.generativeai as genai
 import re
 import os
+import html
+import uuid
+from kv_cache import KVCache
+from link_preview import LinkPreviewService
+from article_render import build_articles_html
+from connectors import CsvUrlConnector, fetch_all, health_report
+from news_data import day_key
+from story_clusters import assign_story_clusters, collapse_stories
+from topic_model import TopicModel, topic_summary, NO_TOPIC
+from trend_detector import TrendCounter, TrendIndex
+from count_cube import CubeCounter, CountCube
+from category_classifier import fill_missing_categories
+from summarizer import BackgroundSummarizer
+from body_fetcher import ArticleBodies, BodyStore, BodyFetcher
+from search_index import BodySearchIndex
+from link_health import LinkHealthChecker, apply_link_health, LINK_DEAD
+from entity_index import EntityTagger, EntityIndex
+from watchlist import Watchlist
+from feedback_store import FeedbackStore, LIKE, DISLIKE, NO_VOTE, week_key, month_key, week_of_month
+from search_analytics import SearchAnalytics
+from dataset_refresher import DatasetRefresher
 
 # --- 페이지 설정 ---
 st.set_page_config(layout="wide")
@@ -102,6 +124,45 @@ st.markdown("""
             color: #333333;
             margin-left: 5px;
         }
+        /* 링크 미리보기 카드 */
+        .preview-card {
+            display: flex;
+            gap: 12px;
+            border: 1px solid #e6e6e6;
+            border-radius: 5px;
+            padding: 10px;
+            margin: 5px 0 10px 0;
+            background-color: #ffffff;
+            color: #333333 !important;
+            text-decoration: none !important;
+        }
+        .preview-card img {
+            width: 120px;
+            height: 80px;
+            object-fit: cover;
+            border-radius: 4px;
+        }
+        .preview-card-site {
+            font-size: 0.8em;
+            color: #888888;
+        }
+        .preview-card-title {
+            font-weight: bold;
+        }
+        .preview-card-desc {
+            font-size: 0.9em;
+            color: #555555;
+        }
+        /* 기사 카드 */
+        .article-card h3 {
+            margin-bottom: 0.3em;
+        }
+        .article-votes {
+            margin-bottom: 0.5em;
+        }
+        .article-dead-link {
+            color: #999999;
+        }
         .st-emotion-cache-nahz7x {
             font-family: 'Malgun Gothic';
         }
@@ -111,29 +172,196 @@ st.markdown("""
 # --- 구글 스프레드시트 CSV URL ---
 CSV_URL = "https://docs.google.com/spreadsheets/d/14I9HkPiBhKs6nXLt6kEBalQHeasrwINWshFDghTHbZE/gviz/tq?tqx=out:csv&sheet=Sheet1"
 
-# --- 데이터 불러오기 ---
-@st.cache_data
-def load_data():
-    df = pd.read_csv(CSV_URL)
-    df.columns = df.columns.str.strip()
-    required_cols = {"date", "category", "theme", "title", "source", "url"}
-    if not required_cols.issubset(df.columns):
-        st.error(f"필수 컬럼 누락: {required_cols - set(df.columns)}")
-        return pd.DataFrame()
-    try:
-        df["date"] = pd.to_datetime(df["date"].str.strip('"') + " 2025", format="%a, %d %b %Y")
-    except Exception as e:
-        st.error("날짜 포맷 오류 발생. 스프레드시트의 날짜 형식을 확인하세요.")
-        st.exception(e)
-        return pd.DataFrame()
-    return df
+# --- 데이터 소스 (여러 개를 등록하면 동시에 읽어 하나로 합침) ---
+# 갱신 스레드와 화면이 같은 커넥터 객체(상태 기록)를 보도록 프로세스에서 한 번만 생성
+@st.cache_resource
+def get_data_sources():
+    return [
+        CsvUrlConnector(
+            "기사 시트",
+            CSV_URL,
+            required_columns={"date", "category", "theme", "title", "source", "url"}
+        ),
+    ]
 
-df = load_data()
+# --- 토픽 분류 모델 (새로 들어온 기사만 이어서 학습) ---
+@st.cache_resource
+def get_topic_model():
+    return TopicModel()
+
+# --- 카테고리 자동 분류 결과 (기사 ID별로 저장) ---
+@st.cache_resource
+def get_category_cache():
+    return KVCache("category_predictions")
+
+# --- 요약이 없는 기사의 자동 요약 (백그라운드 스레드에서 만들어 기사 ID별로 저장) ---
+@st.cache_resource
+def get_summarizer():
+    return BackgroundSummarizer(KVCache("summaries"))
+
+# --- 기사 본문 수집 (링크된 기사를 한 번만 받아 기사 ID별로 압축 저장) ---
+@st.cache_resource
+def get_body_store():
+    return BodyStore()
+
+@st.cache_resource
+def get_body_fetcher():
+    return BodyFetcher(get_body_store())
+
+# --- 링크 상태 확인 (URL별 결과 저장) ---
+@st.cache_resource
+def get_link_checker():
+    return LinkHealthChecker(KVCache("link_health"))
+
+# --- 기업/인물 개체명 사전 (Aho–Corasick 자동자로 한 번에 찾음) ---
+@st.cache_resource
+def get_entity_tagger():
+    return EntityTagger()
+
+# --- 관심 키워드 (수백~수천 개를 자동자 하나로 검사, 기사별 결과 저장) ---
+@st.cache_resource
+def get_watchlist():
+    return Watchlist(KVCache("watchlist_matches"))
+
+# --- 급상승 키워드용 단어 빈도 (기사별 기여분을 유지하며 바뀐 기사만 다시 셈) ---
+@st.cache_resource
+def get_trend_counter():
+    return TrendCounter()
+
+# --- 날짜×테마×카테고리×출처별 기사 수 (바뀐 기사만 반영) ---
+@st.cache_resource
+def get_cube_counter():
+    return CubeCounter()
+
+# --- 데이터 불러오기 (백그라운드 스레드에서 실행되므로 오류는 예외로 알림) ---
+def load_data(sources, topic_model, category_cache, summarizer, body_store, body_fetcher, link_checker, entity_tagger, watchlist, trend_counter, cube_counter):
+    df, errors = fetch_all(sources, force=True)
+    if df.empty and errors:
+        raise next(iter(errors.values()))
+    # 카테고리가 빈 기사는 카테고리가 있는 기사로 학습한 분류기로 채움
+    df = fill_missing_categories(df, category_cache)
+    # 단축/중계 링크는 실제 주소로 바꾸고, 끊긴 링크는 표시 (본문 수집/미리보기에서 제외)
+    df = apply_link_health(df, link_checker)
+    # 아직 본문이 없는 기사는 백그라운드로 수집 (완료되면 데이터를 다시 갱신)
+    # 본문은 길이/버전만 먼저 읽고, 실제 본문은 요약/검사가 필요한 기사만 압축을 풂
+    bodies = ArticleBodies(df, body_store)
+    live_urls = df.loc[df["link_status"] != LINK_DEAD, "url"].dropna()
+    body_fetcher.schedule({idx: url for idx, url in live_urls.items() if idx not in bodies})
+    df["body_chars"] = np.array([bodies.chars(idx) for idx in df.index], dtype="int64")
+    # 저장된 자동 요약을 채우고, 아직 없는 요약은 백그라운드로 요청 (완료되면 데이터를 다시 갱신)
+    df = summarizer.fill(df, bodies)
+    # 여러 매체의 같은 소식을 스토리로 묶어 둠 (화면/프롬프트는 스토리당 한 건만 사용)
+    df = assign_story_clusters(df)
+    df = topic_model.assign(df)
+    # 기사마다 언급된 기업/인물 ID를 붙여 둠 (화면에서는 이 컬럼으로 색인만 만듦)
+    df = entity_tagger.tag(df)
+    # 관심 키워드도 수집할 때 한 번만 검사 (새 기사와 본문이 새로 생긴 기사만)
+    df = watchlist.tag(df, bodies)
+    # 화면에서 쓸 집계표는 여기서 만들어 스냅샷과 함께 게시 (화면 실행에서는 읽기만 함)
+    extras = trend_counter.update(df)
+    extras["count_cube"] = cube_counter.update(df)
+    return df, extras
+
+# --- 데이터 백그라운드 갱신 (화면은 항상 마지막 정상 데이터를 사용) ---
+REFRESH_INTERVAL_SECONDS = 5 * 60
+FIRST_LOAD_POLL_SECONDS = 2
+
+@st.cache_resource
+def get_dataset_refresher():
+    sources, topic_model, category_cache = get_data_sources(), get_topic_model(), get_category_cache()
+    summarizer, body_store, body_fetcher, link_checker = get_summarizer(), get_body_store(), get_body_fetcher(), get_link_checker()
+    entity_tagger, watchlist = get_entity_tagger(), get_watchlist()
+    trend_counter, cube_counter = get_trend_counter(), get_cube_counter()
+    refresher = DatasetRefresher(
+        lambda: load_data(
+            sources, topic_model, category_cache, summarizer, body_store, body_fetcher, link_checker,
+            entity_tagger, watchlist, trend_counter, cube_counter
+        ),
+        interval=REFRESH_INTERVAL_SECONDS
+    )
+    summarizer.on_update = refresher.request_refresh
+    body_fetcher.on_update = refresher.request_refresh
+    return refresher.start()
+
+# --- 링크 미리보기 카드 서비스 (프로세스 전체에서 공유) ---
+PREVIEW_TTL_SECONDS = 7 * 24 * 60 * 60
+
+@st.cache_resource
+def get_preview_service():
+    return LinkPreviewService(KVCache("link_previews", ttl=PREVIEW_TTL_SECONDS))
+
+# --- 좋아요/싫어요 저장소 (모든 세션이 공유) ---
+RANKING_SIZE = 5
+
+@st.cache_resource
+def get_feedback_store():
+    return FeedbackStore()
+
+# --- 검색어 통계 (모든 세션의 검색어를 시간 구간별로 집계) ---
+@st.cache_resource
+def get_search_analytics():
+    return SearchAnalytics()
+
+# --- 급상승 키워드 계산용 단어 빈도 (스냅샷 버전마다 게시된 집계표에서 한 번만 만듦) ---
+TREND_KEYWORDS = 15
+TREND_HEADLINES = 10
+
+@st.cache_resource(max_entries=2)
+def get_trend_index(version, _extras):
+    return TrendIndex(_extras.get("trend_terms"), _extras.get("trend_docs"))
+
+# --- 날짜×테마×카테고리×출처별 기사 수 (기간 비교는 원본 행 대신 수집 단계에서 게시된 집계를 사용) ---
+@st.cache_resource(max_entries=2)
+def get_count_cube(version, _extras):
+    return CountCube(_extras.get("count_cube"))
+
+# --- 기업/인물 → 기사 행 번호 색인 ---
+ENTITY_CONTEXT_STORIES = 15
+
+@st.cache_resource
+def get_entity_index():
+    return EntityIndex()
+
+# --- 관심 키워드 → 기사 행 번호 색인 ---
+WATCHLIST_ARTICLES = 30
+
+@st.cache_resource
+def get_watch_index():
+    return EntityIndex(column="watch_terms")
+
+# --- 본문 검색용 단어 색인 ---
+@st.cache_resource
+def get_body_index():
+    return BodySearchIndex()
+
+# 첫 데이터가 준비될 때까지 안내만 보여 주고, 이 부분만 주기적으로 다시 실행해 준비되면 전체 화면을 다시 그림
+@st.fragment(run_every=FIRST_LOAD_POLL_SECONDS)
+def wait_for_first_load():
+    if dataset_refresher.current() is not None:
+        st.rerun()
+    if dataset_refresher.last_error is not None:
+        st.error(f"데이터를 불러오지 못했습니다: {dataset_refresher.last_error} (자동으로 다시 시도합니다)")
+    else:
+        st.info("데이터를 불러오는 중입니다. 준비되면 화면이 자동으로 표시됩니다.")
+
+dataset_refresher = get_dataset_refresher()
+snapshot = dataset_refresher.current()
+if snapshot is None:
+    wait_for_first_load()
+    st.stop()
+
+df = snapshot.frame
 
 if df.empty:
     st.stop()
 
-df['category'] = df['category'].fillna(df['theme'])
+trend_index = get_trend_index(snapshot.version, snapshot.extras)
+count_cube = get_count_cube(snapshot.version, snapshot.extras)
+body_index = get_body_index()
+body_index.sync(df, get_body_store(), version=snapshot.version)
+# 행 번호 색인은 이 실행이 받은 버전의 것을 계속 사용 (다른 세션이 새 버전으로 바꿔도 섞이지 않음)
+entity_index = get_entity_index().sync(df, version=snapshot.version)
+watch_index = get_watch_index().sync(df, version=snapshot.version)
 
 # 세션 상태 초기화
 def clear_analysis_result():
@@ -142,11 +370,47 @@ def clear_analysis_result():
             del st.session_state[key]
     st.session_state.filters_changed = True
 
+# --- 미리보기 열기/닫기 ---
+MAX_OPEN_PREVIEWS = 3
+
+def toggle_preview(idx):
+    open_previews = st.session_state.open_previews
+    if idx in open_previews:
+        open_previews.remove(idx)
+        return
+    open_previews.append(idx)
+    # 제한을 넘으면 가장 먼저 연 미리보기부터 닫음
+    while len(open_previews) > MAX_OPEN_PREVIEWS:
+        open_previews.pop(0)
+
+# --- 좋아요/싫어요 토글 ---
+def toggle_vote(idx, vote):
+    current = st.session_state.my_votes.get(idx, NO_VOTE)
+    get_feedback_store().record_vote(st.session_state.session_id, idx, NO_VOTE if current == vote else vote)
+
+# --- 같은 소식을 보도한 매체 수 (프롬프트에 중복 기사 대신 한 줄로 전달) ---
+def coverage_line(idx, related):
+    others = related.get(idx)
+    return f"보도 매체 수: {len(others) + 1}\n" if others else ""
+
+# --- 질문에 나온 기업/인물의 최근 기사 (질문 프롬프트에 참고 자료로 첨부) ---
+def entity_context(question, extra_entity_ids=()):
+    entity_ids = list(dict.fromkeys(get_entity_tagger().find(question) + list(extra_entity_ids)))
+    if not entity_ids:
+        return entity_ids, ""
+    mentioned = df.iloc[entity_index.rows(entity_ids)].sort_values("date", ascending=False)
+    stories, related = collapse_stories(mentioned)
+    context = ""
+    for idx, row in stories.head(ENTITY_CONTEXT_STORIES).iterrows():
+        date_text = row['date'].strftime('%Y-%m-%d') if pd.notna(row['date']) else ""
+        context += f"- {row['title']} ({row['source']}, {date_text})\n  {coverage_line(idx, related)}  요약: {row.get('summary', '요약 없음')}\n"
+    return entity_ids, context
+
 # --- 보고서 생성 함수 ---
-def generate_report(filtered_df, analysis_result):
+def generate_report(stories_df, related, analysis_result):
     articles_text = ""
-    for _, row in filtered_df.iterrows():
-        articles_text += f"제목: {row['title']}\n출처: {row['source']} ({row['date'].strftime('%Y-%m-%d')})\n요약: {row.get('summary', '요약 없음')}\nURL: {row.get('url', '없음')}\n\n"
+    for idx, row in stories_df.iterrows():
+        articles_text += f"제목: {row['title']}\n출처: {row['source']} ({row['date'].strftime('%Y-%m-%d')})\n{coverage_line(idx, related)}요약: {row.get('summary', '요약 없음')}\nURL: {row.get('url', '없음')}\n\n"
 
     report_prompt = f"""
     [트렌드 분석 결과]
@@ -169,13 +433,13 @@ def generate_report(filtered_df, analysis_result):
         st.error(f"보고서 생성 중 오류 발생: {e}")
 
 # --- AI 추천 기사 생성 함수 (ID 반환) ---
-def get_ai_recommendations(filtered_df):
+def get_ai_recommendations(stories_df, related):
     articles_text = ""
-    for idx, row in filtered_df.iterrows():
-        articles_text += f"기사ID: {idx}\n제목: {row['title']}\n요약: {row.get('summary', '요약 없음')}\n\n"
+    for idx, row in stories_df.iterrows():
+        articles_text += f"기사ID: {idx}\n제목: {row['title']}\n{coverage_line(idx, related)}요약: {row.get('summary', '요약 없음')}\n\n"
     
-    num_to_recommend = min(2, len(filtered_df) // 10) if len(filtered_df) >= 10 else 0
-    if num_to_recommend == 0 and len(filtered_df) > 0:
+    num_to_recommend = min(2, len(stories_df) // 10) if len(stories_df) >= 10 else 0
+    if num_to_recommend == 0 and len(stories_df) > 0:
         num_to_recommend = 1
     
     if num_to_recommend == 0:
@@ -183,7 +447,7 @@ def get_ai_recommendations(filtered_df):
 
     recommendation_prompt = f"""
     아래 뉴스 기사 목록을 분석하여, 가장 중요하거나 영향력 있는 기사 {num_to_recommend}개를 선정하고 해당 기사의 '기사ID'를 쉼표로 구분하여 반환해.
-    예시: 12, 15, 20
+    예시: 3f2a9c1b7d4e, 9b1c0e2f4a6d
     
     뉴스 기사:
     {articles_text}
@@ -191,7 +455,7 @@ def get_ai_recommendations(filtered_df):
     try:
         response = genai.GenerativeModel('gemini-1.5-pro').generate_content(recommendation_prompt)
         rec_ids_str = response.text.strip()
-        rec_ids = [int(id_str) for id_str in rec_ids_str.split(',') if id_str.strip().isdigit()]
+        rec_ids = [id_str.strip() for id_str in rec_ids_str.split(',') if id_str.strip() in stories_df.index]
         return rec_ids
     except Exception as e:
         st.error(f"AI 추천 기사 생성 중 오류 발생: {e}")
@@ -201,20 +465,29 @@ def get_ai_recommendations(filtered_df):
 if 'last_filters' not in st.session_state:
     st.session_state.last_filters = {}
     st.session_state.filters_changed = True
-if 'search_history' not in st.session_state:
-    st.session_state.search_history = {}
-if 'likes' not in st.session_state:
-    st.session_state.likes = {}
-if 'dislikes' not in st.session_state:
-    st.session_state.dislikes = {}
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 if 'selected_themes' not in st.session_state:
     st.session_state.selected_themes = list(sorted(df["theme"].dropna().unique()))
 if 'ai_recommendations' not in st.session_state:
     st.session_state.ai_recommendations = []
+if 'open_previews' not in st.session_state:
+    st.session_state.open_previews = []
 
 # --- 사이드바 필터 영역 ---
 with st.sidebar:
     st.title("⚙️ 뉴스 필터")
+
+    # 데이터 기준 시각 (갱신 실패 시 마지막 정상 데이터를 계속 사용)
+    data_age_minutes = int(dataset_refresher.age_seconds() // 60)
+    st.caption(f"🕒 데이터 확인: {data_age_minutes}분 전 (버전 {snapshot.version})")
+    if dataset_refresher.last_error is not None:
+        st.warning(f"최신 데이터를 가져오지 못해 이전 데이터를 표시합니다: {dataset_refresher.last_error}")
+    with st.expander("🔌 데이터 소스 상태", expanded=False):
+        st.dataframe(
+            pd.DataFrame(health_report(get_data_sources())).T[["kind", "rows", "last_latency", "failures", "last_error"]],
+            use_container_width=True
+        )
     
     all_themes = sorted(df["theme"].dropna().unique())
     
@@ -236,6 +509,25 @@ with st.sidebar:
         st.session_state.filters_changed = True
         st.session_state.old_themes = selected_themes_box
 
+    # 기업/인물 (기사 수가 많은 순, 선택하지 않으면 전체)
+    entity_counts = entity_index.counts()
+    entity_names = {e: get_entity_tagger().entities[e]["name"] for e in entity_counts if e in get_entity_tagger().entities}
+    selected_entities = st.multiselect(
+        "🏢 기업·인물",
+        sorted(entity_names, key=lambda e: -entity_counts[e]),
+        format_func=lambda e: f"{entity_names[e]} ({entity_counts[e]})",
+        placeholder="전체"
+    )
+
+    # 내용으로 자동 분류한 토픽 (선택하지 않으면 전체)
+    topic_names = df.loc[df["topic_id"] != NO_TOPIC, "topic"].value_counts()
+    selected_topics = st.multiselect(
+        "🧩 토픽",
+        list(topic_names.index),
+        format_func=lambda topic: f"{topic} ({topic_names[topic]})",
+        placeholder="전체 토픽"
+    )
+
     st.markdown("---")
     
     valid_dates = df["date"].dropna()
@@ -250,6 +542,8 @@ with st.sidebar:
         value=latest_date
     )
 
+    hide_dead_links = st.checkbox("🔗 끊긴 링크 기사 숨기기", value=False)
+
     search_query = st.text_input(
         "🔍 키워드 검색", 
         placeholder="검색할 키워드를 입력하세요."
@@ -265,7 +559,18 @@ with st.sidebar:
         if gemini_query:
             with st.spinner("답변을 생성하는 중..."):
                 try:
-                    response = genai.GenerativeModel('gemini-1.5-pro').generate_content(gemini_query)
+                    # 질문에 나온(또는 필터에서 고른) 기업/인물의 최근 기사를 함께 전달
+                    _, context_text = entity_context(gemini_query, selected_entities)
+                    question_prompt = gemini_query
+                    if context_text:
+                        question_prompt = f"""
+                        아래의 최근 뉴스 기사들을 참고해서 질문에 답해 줘. 기사에 없는 내용은 추측이라고 밝혀 줘.
+                        [참고 기사]
+                        {context_text}
+                        [질문]
+                        {gemini_query}
+                        """
+                    response = genai.GenerativeModel('gemini-1.5-pro').generate_content(question_prompt)
                     st.session_state.gemini_response = response.text
                 except Exception as e:
                     st.session_state.gemini_response = f"질문 처리 중 오류 발생: {e}"
@@ -277,6 +582,9 @@ with st.sidebar:
 # --- 필터링 로직 ---
 current_filters = {
     "themes": st.session_state.selected_themes,
+    "topics": selected_topics,
+    "entities": selected_entities,
+    "hide_dead_links": hide_dead_links,
     "start_date": start_date,
     "end_date": end_date,
     "search_query": search_query
@@ -288,26 +596,45 @@ if st.session_state.last_filters != current_filters:
 else:
     st.session_state.filters_changed = False
 
-filtered_df = df.copy()
+# 공유 데이터(df)는 복사하거나 수정하지 않고, 조건에 맞는 행 번호만 골라 필요한 행만 꺼냄
+row_mask = np.ones(len(df), dtype=bool)
 if st.session_state.selected_themes:
-    filtered_df = filtered_df[filtered_df["theme"].isin(st.session_state.selected_themes)]
+    row_mask &= df["theme"].isin(st.session_state.selected_themes).to_numpy()
+
+if selected_topics:
+    row_mask &= df["topic"].isin(selected_topics).to_numpy()
+
+if selected_entities:
+    # 색인에서 해당 기업/인물을 언급한 행만 바로 꺼냄 (전체 행 검색 없음)
+    entity_mask = np.zeros(len(df), dtype=bool)
+    entity_mask[entity_index.rows(selected_entities)] = True
+    row_mask &= entity_mask
+
+if hide_dead_links:
+    row_mask &= (df["link_status"] != LINK_DEAD).to_numpy()
 
 if start_date and end_date:
-    filtered_df = filtered_df[
-        (filtered_df["date"].dt.date >= start_date) & 
-        (filtered_df["date"].dt.date <= end_date)
-    ]
+    day_values = df["day"].to_numpy()
+    row_mask &= (day_values >= day_key(start_date)) & (day_values <= day_key(end_date))
 
-if search_query:
-    if search_query in st.session_state.search_history:
-        st.session_state.search_history[search_query] += 1
-    else:
-        st.session_state.search_history[search_query] = 1
+# 같은 검색어로 다시 실행되거나 입력을 고쳐 쓰는 경우는 한 번만 집계됨 (검색창을 비운 것도 알려 줌)
+get_search_analytics().log_query(st.session_state.session_id, search_query)
 
-    filtered_df = filtered_df[
-        filtered_df["title"].str.contains(search_query, case=False, na=False) |
-        filtered_df.get("summary", pd.Series(dtype='object')).str.contains(search_query, case=False, na=False)
-    ]
+if search_query:
+    # 앞의 조건을 통과한 행에서만 문자열 검색
+    candidate_ids = np.flatnonzero(row_mask)
+    candidates = df.iloc[candidate_ids]
+    matched = (
+        candidates["title"].str.contains(search_query, case=False, na=False) |
+        candidates["summary"].str.contains(search_query, case=False, na=False) |
+        candidates.index.isin(body_index.search(search_query))
+    ).to_numpy()
+    row_mask[:] = False
+    row_mask[candidate_ids[matched]] = True
+
+filtered_df = df.iloc[np.flatnonzero(row_mask)]
+# 같은 소식은 대표 기사 하나로 (다른 매체 기사는 related로 함께 표시)
+stories_df, story_related = collapse_stories(filtered_df)
 
 # --- 메인 화면 ---
 # 로고와 제목을 한 줄에 배치
@@ -323,78 +650,123 @@ with header_col2:
 st.markdown("---")
 
 # --- 탭 구성 ---
-tab1, tab2, tab3 = st.tabs(["📊 뉴스 검색 결과", "🤖 통합 인사이트 & 보고서", "📈 검색 통계"])
+tab1, tab2, tab3, tab4 = st.tabs(["📊 뉴스 검색 결과", "🤖 통합 인사이트 & 보고서", "📈 검색 통계", "👀 관심 키워드"])
 
 with tab1:
     if not filtered_df.empty:
         # 카테고리별 뉴스 개수 표
-        category_counts = filtered_df.groupby(['theme', 'category']).size().reset_index(name='뉴스 개수')
+        category_counts = filtered_df.groupby(['theme', 'category'], observed=True).agg(
+            **{'뉴스 개수': ('title', 'size'), '스토리 수': ('story_id', 'nunique')}
+        ).reset_index()
         
         st.subheader("카테고리별 뉴스 개수")
         
         # MultiIndex를 활용하여 열 병합 효과 구현
         category_counts.set_index(['theme', 'category'], inplace=True)
         st.dataframe(category_counts, use_container_width=True)
+
+        # 기간 비교 (미리 집계한 날짜별 기사 수로 계산, 테마 필터만 적용)
+        with st.expander("📊 기간 비교", expanded=False):
+            compare_col, group_col = st.columns(2)
+            compare_options = {
+                "selected": "선택 기간 vs 직전 같은 기간",
+                "week": "최근 7일 vs 직전 7일",
+                "month": "최근 30일 vs 직전 30일",
+            }
+            compare_mode = compare_col.radio("비교 기간", list(compare_options.keys()), format_func=compare_options.get, key="compare_mode")
+            group_options = {"theme_category": "테마/카테고리", "theme": "테마", "source": "출처"}
+            group_mode = group_col.radio("묶음 기준", list(group_options.keys()), format_func=group_options.get, key="compare_group")
+
+            compare_last = day_key(end_date)
+            compare_length = {"week": 7, "month": 30}.get(compare_mode, compare_last - day_key(start_date) + 1)
+            if compare_length < 1:
+                # 시작일이 종료일보다 늦으면 종료일 하루만 비교
+                st.warning("시작일이 종료일보다 늦어 종료일 하루만 비교합니다.")
+                compare_length = 1
+            compare_table = count_cube.compare(
+                (compare_last - compare_length + 1, compare_last),
+                (compare_last - 2 * compare_length + 1, compare_last - compare_length),
+                by={"theme_category": ("theme", "category"), "theme": ("theme",), "source": ("source",)}[group_mode],
+                themes=st.session_state.selected_themes or None,
+            )
+            st.caption(f"{compare_length}일 단위로 비교합니다. (종료일 기준)")
+            st.dataframe(compare_table, use_container_width=True)
         
         st.markdown("---")
         
         # AI 추천 기사 선정 및 세션 저장
-        if st.session_state.get('filters_changed', True) and len(filtered_df) > 0:
+        if st.session_state.get('filters_changed', True) and len(stories_df) > 0:
             with st.spinner("AI가 추천 기사를 선별하고 있습니다..."):
-                st.session_state.ai_recommendations = get_ai_recommendations(filtered_df)
+                st.session_state.ai_recommendations = get_ai_recommendations(stories_df, story_related)
 
         # AI 추천 기사 우선 정렬
-        recommended_df = filtered_df[filtered_df.index.isin(st.session_state.ai_recommendations)]
-        other_df = filtered_df[~filtered_df.index.isin(st.session_state.ai_recommendations)]
+        recommended_df = stories_df[stories_df.index.isin(st.session_state.ai_recommendations)]
+        other_df = stories_df[~stories_df.index.isin(st.session_state.ai_recommendations)]
         sorted_df = pd.concat([recommended_df, other_df])
 
+        # 화면에 표시할 기사들의 미리보기 카드 중 저장된 것만 바로 사용 (나머지는 백그라운드로 가져와 다음 실행부터 표시)
+        preview_cards = get_preview_service().get_previews(
+            sorted_df.loc[sorted_df["link_status"] != LINK_DEAD, "url"].dropna().tolist()
+        )
+
+        # 이 세션의 투표와 전체 사용자 집계를 한 번에 읽어옴
+        st.session_state.my_votes = get_feedback_store().session_votes(st.session_state.session_id)
+        vote_counts = get_feedback_store().counts(sorted_df.index)
+
         categories = sorted_df["category"].dropna().unique()
         for category in categories:
             with st.expander(f"📚 {category} ({(sorted_df['category'] == category).sum()}건)", expanded=True):
                 cat_df = sorted_df[sorted_df["category"] == category]
-                for idx, row in cat_df.iterrows():
-                    title_html = f"### 💡 {row['title']}"
-                    if idx in st.session_state.ai_recommendations:
-                        title_html += ' <span class="ai-recommend-badge">AI 추천</span>'
-                    st.markdown(title_html, unsafe_allow_html=True)
-                    
-                    st.markdown(f"- 🏢 **{row['source']}** ({row['date'].strftime('%Y-%m-%d')})")
-                    st.markdown(f"- 📌 {row.get('summary', '요약 없음')}")
 
-                    # 좋아요/싫어요 버튼 추가
-                    like_col, dislike_col, space_col = st.columns([0.1, 0.1, 0.8])
-                    
-                    is_liked = st.session_state.likes.get(idx, 0) == 1
-                    is_disliked = st.session_state.dislikes.get(idx, 0) == 1
-                    
-                    if like_col.button("👍" + (" 취소" if is_liked else ""), key=f"like_{idx}"):
-                        if is_liked:
-                            st.session_state.likes[idx] = 0
-                        else:
-                            st.session_state.likes[idx] = 1
-                            st.session_state.dislikes[idx] = 0
-                        st.rerun()
-                    
-                    if dislike_col.button("👎" + (" 취소" if is_disliked else ""), key=f"dislike_{idx}"):
-                        if is_disliked:
-                            st.session_state.dislikes[idx] = 0
-                        else:
-                            st.session_state.dislikes[idx] = 1
-                            st.session_state.likes[idx] = 0
+                # 기사 내용은 카테고리마다 HTML 블록 하나로 출력
+                st.markdown(
+                    build_articles_html(
+                        cat_df,
+                        st.session_state.ai_recommendations,
+                        vote_counts,
+                        preview_cards,
+                        {idx: filtered_df.loc[story_related[idx]] for idx in cat_df.index if idx in story_related},
+                    ),
+                    unsafe_allow_html=True
+                )
+
+                # 좋아요/싫어요/미리보기 버튼은 선택한 기사 하나에 대해서만 표시
+                select_col, like_col, dislike_col, preview_col = st.columns([0.55, 0.15, 0.15, 0.15])
+                selected_idx = select_col.selectbox(
+                    "평가할 기사 선택",
+                    list(cat_df.index),
+                    format_func=cat_df["title"].to_dict().get,
+                    key=f"select_{category}",
+                    label_visibility="collapsed"
+                )
+
+                is_liked = st.session_state.my_votes.get(selected_idx) == LIKE
+                is_disliked = st.session_state.my_votes.get(selected_idx) == DISLIKE
+                if like_col.button("👍" + (" 취소" if is_liked else ""), key=f"like_{category}", use_container_width=True):
+                    toggle_vote(selected_idx, LIKE)
+                    st.rerun()
+                if dislike_col.button("👎" + (" 취소" if is_disliked else ""), key=f"dislike_{category}", use_container_width=True):
+                    toggle_vote(selected_idx, DISLIKE)
+                    st.rerun()
+
+                # 원본 페이지 iframe은 버튼을 눌렀을 때만 생성 (세션당 동시 개수 제한)
+                selected_url = cat_df.at[selected_idx, "url"]
+                if pd.notna(selected_url) and selected_url != "" and cat_df.at[selected_idx, "link_status"] != LINK_DEAD:
+                    is_previewing = selected_idx in st.session_state.open_previews
+                    if preview_col.button("🖼️ 원본" + (" 닫기" if is_previewing else ""), key=f"preview_{category}", use_container_width=True):
+                        toggle_preview(selected_idx)
                         st.rerun()
-                    
-                    st.write(f"👍 {st.session_state.likes.get(idx, 0)} | 👎 {st.session_state.dislikes.get(idx, 0)}")
-
-                    if pd.notna(row.get("url")) and row["url"] != "":
-                        st.markdown(f"[📖 본문 보기]({row['url']})")
-                        with st.expander("🖼️ 미리보기", expanded=False):
-                            components.html(
-                                f'<iframe src="{row["url"]}" width="100%" height="600px"></iframe>',
-                                height=600,
-                                scrolling=False
-                            )
-                            st.info("미리보기가 보이지 않는다면, 해당 웹사이트에서 미리보기 기능을 지원하지 않는 것일 수 있습니다.")
-                    st.markdown("---")
+
+                for idx in st.session_state.open_previews:
+                    if idx not in cat_df.index:
+                        continue
+                    st.caption(f"🖼️ {cat_df.at[idx, 'title']}")
+                    components.html(
+                        f'<iframe src="{cat_df.at[idx, "url"]}" width="100%" height="600px"></iframe>',
+                        height=600,
+                        scrolling=False
+                    )
+                    st.info("미리보기가 보이지 않는다면, 해당 웹사이트에서 미리보기 기능을 지원하지 않는 것일 수 있습니다.")
     else:
         st.markdown("### 😥 해당 뉴스 없음")
         st.info("날짜, 테마 또는 키워드 필터를 다시 설정해 보세요.")
@@ -419,6 +791,25 @@ with tab2:
         
         st.markdown("---")
 
+        # 급상승 키워드는 미리 집계한 빈도로 바로 계산 (AI 호출 없음)
+        st.subheader("📈 급상승 키워드")
+        st.caption("선택한 기간의 키워드 빈도를 직전 2주 평균과 비교합니다. (테마·날짜 필터 기준)")
+        trend_table = trend_index.bursts(
+            day_key(start_date), day_key(end_date), st.session_state.selected_themes or None, limit=TREND_KEYWORDS
+        )
+        if trend_table.empty:
+            st.info("직전 기간보다 눈에 띄게 늘어난 키워드가 없습니다.")
+        else:
+            st.dataframe(trend_table.set_index("키워드"), use_container_width=True)
+            trend_chart = trend_index.daily_counts(
+                trend_table["키워드"].head(5).tolist(),
+                day_key(start_date) - 13, day_key(end_date), st.session_state.selected_themes or None
+            )
+            trend_chart.index = pd.to_datetime(trend_chart.index, unit="D")
+            st.line_chart(trend_chart)
+
+        st.markdown("---")
+
         topic_value = ""
         if search_query:
             topic_value = f'"{search_query}"'
@@ -435,14 +826,22 @@ with tab2:
             st.warning("필터가 변경되었습니다. 새로운 트렌드 분석을 시작하려면 아래 버튼을 클릭하세요.")
             if st.button("✨ 트렌드 분석 시작", key="start_analysis"):
                 with st.spinner("제미나이가 뉴스 트렌드를 분석하고 있습니다..."):
-                    articles_text = ""
-                    for _, row in filtered_df.iterrows():
-                        articles_text += f"제목: {row['title']}\n요약: {row.get('summary', '요약 없음')}\n\n"
+                    # 기사 원문 대신 미리 계산한 표와 주요 소식 제목만 전달
+                    headlines_text = ""
+                    top_stories = stories_df.sort_values("story_size", ascending=False, kind="stable").head(TREND_HEADLINES)
+                    for idx, row in top_stories.iterrows():
+                        headlines_text += f"- {row['title']} ({coverage_line(idx, story_related).strip() or '보도 매체 수: 1'})\n"
+                    # 토픽별 기사/스토리/매체 수 (어떤 주제가 많이 다뤄졌는지 한눈에 전달)
+                    topic_table = topic_summary(filtered_df).to_string(index=False)
                     
                     analysis_prompt = f"""
-                    아래에 제공된 뉴스 기사들을 분석하여, 1. 2. 3. ...와 같이 최대 {num_summary}개의 번호로 핵심 트렌드와 사견을 요약해 줘. 각 항목은 한 문장으로 작성하고, 줄바꿈으로 구분해. 특별한 서식(볼드체, 따옴표 등)은 사용하지 마.
-                    뉴스 기사:
-                    {articles_text}
+                    아래의 급상승 키워드 표, 토픽별 보도량 표, 주요 소식 제목을 바탕으로 1. 2. 3. ...와 같이 최대 {num_summary}개의 번호로 핵심 트렌드와 사견을 요약해 줘. 각 항목은 한 문장으로 작성하고, 줄바꿈으로 구분해. 특별한 서식(볼드체, 따옴표 등)은 사용하지 마.
+                    급상승 키워드 (최근 기사 수, 평소 하루 평균, 증가율, z 점수가 클수록 평소보다 많이 등장):
+                    {trend_table.to_string(index=False) if not trend_table.empty else "없음"}
+                    토픽별 보도량 (topic: 토픽 핵심어, articles: 기사 수, stories: 중복 제외 소식 수, sources: 매체 수):
+                    {topic_table}
+                    주요 소식:
+                    {headlines_text}
                     """
                     try:
                         response = genai.GenerativeModel('gemini-1.5-pro').generate_content(analysis_prompt)
@@ -469,7 +868,7 @@ with tab2:
                 with st.spinner("보고서를 생성하고 있습니다..."):
                     analysis_result_for_report = st.session_state.get('analysis_result', None)
                     if analysis_result_for_report:
-                        generate_report(filtered_df, analysis_result_for_report)
+                        generate_report(stories_df, story_related, analysis_result_for_report)
                     else:
                         st.warning("먼저 '트렌드 분석'을 실행하여 분석 결과를 생성해 주세요.")
             
@@ -490,9 +889,18 @@ with tab2:
 
 with tab3:
     st.subheader("📈 키워드 검색 선호도 (Top 5)")
-    if 'search_history' in st.session_state and st.session_state.search_history:
-        search_counts = pd.DataFrame(st.session_state.search_history.items(), columns=['키워드', '검색 횟수'])
-        search_counts = search_counts.sort_values(by='검색 횟수', ascending=False).head(5)
+    search_window_labels = {"hour": "최근 1시간", "day": "오늘", "week": "이번 주"}
+    search_window = st.radio(
+        "집계 기간",
+        list(search_window_labels.keys()),
+        index=1,
+        format_func=search_window_labels.get,
+        horizontal=True,
+        key="search_window"
+    )
+    top_searches = get_search_analytics().top(search_window, 5)
+    if top_searches:
+        search_counts = pd.DataFrame(top_searches, columns=['키워드', '검색 횟수'])
         
         st.dataframe(search_counts.set_index('키워드'), use_container_width=True)
         st.bar_chart(search_counts.set_index('키워드'))
@@ -503,39 +911,81 @@ with tab3:
     
     # 현재 날짜 기준 주차 계산
     today = datetime.now()
-    week_of_month = (today.day - 1) // 7 + 1
+    ranking_periods = {
+        week_key(today): f"{today.month}월 {week_of_month(today)}주차",
+        month_key(today): f"{today.month}월",
+    }
+    ranking_period = st.radio(
+        "순위 기간",
+        list(ranking_periods.keys()),
+        format_func=ranking_periods.get,
+        horizontal=True,
+        key="ranking_period"
+    )
     
-    st.subheader(f"❤️ {today.month}월 {week_of_month}주차 선호 뉴스 순위 (Top 5)")
-    if st.session_state.likes or st.session_state.dislikes:
-        like_dislike_data = []
-        all_indices = set(st.session_state.likes.keys()) | set(st.session_state.dislikes.keys())
-
-        for idx in all_indices:
-            likes = st.session_state.likes.get(idx, 0)
-            dislikes = st.session_state.dislikes.get(idx, 0)
-            score = likes - dislikes
-            if score != 0:
-                like_dislike_data.append({
-                    'index': idx,
-                    '점수': score
-                })
-        
-        if like_dislike_data:
-            ranking_df = pd.DataFrame(like_dislike_data)
-            ranking_df = ranking_df.sort_values(by='점수', ascending=False).head(5)
-            
-            ranking_list = []
-            for i, idx in enumerate(ranking_df['index']):
-                title = df.loc[idx]['title']
-                url = df.loc[idx].get('url', '#')
-                ranking_list.append({
-                    '순위': i + 1,
-                    '뉴스 제목': title,
-                    '본문 링크': f'<a href="{url}" target="_blank">🔗</a>'
-                })
-            
-            st.markdown(pd.DataFrame(ranking_list).to_html(escape=False, index=False), unsafe_allow_html=True)
-        else:
-            st.info("아직 선호 점수가 집계된 뉴스가 없습니다. 좋아요/싫어요 버튼을 눌러보세요.")
+    st.subheader(f"❤️ {ranking_periods[ranking_period]} 선호 뉴스 순위 (Top {RANKING_SIZE})")
+    # 투표가 들어올 때마다 갱신되는 주간/월간 점수표에서 상위 기사만 읽어옴
+    ranking_list = []
+    for idx, likes, dislikes, score in get_feedback_store().top_k(RANKING_SIZE * 2, period=ranking_period):
+        # 데이터 갱신으로 사라진 기사는 건너뜀
+        if idx not in df.index:
+            continue
+        title = df.loc[idx]['title']
+        url = df.loc[idx].get('url', '#')
+        ranking_list.append({
+            '순위': len(ranking_list) + 1,
+            '뉴스 제목': title,
+            '본문 링크': f'<a href="{url}" target="_blank">🔗</a>'
+        })
+        if len(ranking_list) == RANKING_SIZE:
+            break
+
+    if ranking_list:
+        st.markdown(pd.DataFrame(ranking_list).to_html(escape=False, index=False), unsafe_allow_html=True)
     else:
-        st.info("아직 좋아요/싫어요를 받은 뉴스가 없습니다. 좋아요/싫어요 버튼을 눌러보세요.")
\ No newline at end of file
+        st.info("아직 선호 점수가 집계된 뉴스가 없습니다. 좋아요/싫어요 버튼을 눌러보세요.")
+
+with tab4:
+    st.subheader("👀 관심 키워드별 기사 수")
+    st.caption("수집할 때 미리 찾아 둔 결과로 집계합니다. 사이드바의 테마·기간·검색 조건이 함께 적용됩니다.")
+    watchlist = get_watchlist()
+    watch_terms = watchlist.terms()
+    # 키워드마다 색인의 행 번호 중 현재 조건을 통과한 행만 셈 (기사 본문을 다시 훑지 않음)
+    watch_rows = {term: watch_index.rows([term]) for term in watch_terms}
+    watch_hits = {term: rows[row_mask[rows]] for term, rows in watch_rows.items()}
+    watch_table = pd.DataFrame({
+        '키워드': watch_terms,
+        '기사 수': [len(watch_hits[t]) for t in watch_terms],
+        '전체 기사 수': [len(watch_rows[t]) for t in watch_terms],
+    }, columns=['키워드', '기사 수', '전체 기사 수']).sort_values('기사 수', ascending=False, kind='stable')
+
+    if watch_table.empty:
+        st.info("관심 키워드가 없습니다. 아래에서 키워드를 추가해 보세요.")
+    else:
+        st.dataframe(watch_table.set_index('키워드'), use_container_width=True)
+        matched_terms = watch_table.loc[watch_table['기사 수'] > 0, '키워드'].tolist()
+        if matched_terms:
+            watch_term = st.selectbox(
+                "기사 목록을 볼 키워드",
+                matched_terms,
+                format_func=lambda t: f"{t} ({len(watch_hits[t])})",
+                key="watch_term"
+            )
+            watch_articles = df.iloc[watch_hits[watch_term]].sort_values('date', ascending=False).head(WATCHLIST_ARTICLES)
+            watch_list = [{
+                '날짜': row['date'].strftime('%Y-%m-%d') if pd.notna(row['date']) else '',
+                '뉴스 제목': html.escape(str(row['title'])),
+                '출처': html.escape(str(row['source'])) if pd.notna(row['source']) else '',
+                '본문 링크': f'<a href="{html.escape(str(row["url"]))}" target="_blank">🔗</a>' if pd.notna(row['url']) else '',
+            } for _, row in watch_articles.iterrows()]
+            st.markdown(pd.DataFrame(watch_list).to_html(escape=False, index=False), unsafe_allow_html=True)
+        else:
+            st.info("현재 조건에서 관심 키워드가 나온 기사가 없습니다.")
+
+    with st.expander("✏️ 관심 키워드 편집", expanded=False):
+        edited_terms = st.text_area("한 줄에 하나씩 입력", "\n".join(watch_terms), height=200, key="watch_terms_text")
+        if st.button("저장", key="watch_terms_save"):
+            saved_terms = watchlist.save(edited_terms.splitlines())
+            # 바뀐 목록으로 전체 기사를 한 번 다시 검사하도록 갱신 요청
+            dataset_refresher.request_refresh()
+            st.success(f"관심 키워드 {len(saved_terms)}개를 저장했습니다. 다음 데이터 갱신부터 반영됩니다.")
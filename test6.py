@@ -1,8 +1,7 @@
 import streamlit as st
 import pandas as pd
-import gdown
-import os
 from datetime import datetime
+from drive_loader import DriveLoader, extract_file_id
 
 st.set_page_config(page_title="AI 뉴스 대시보드", layout="wide")
 
@@ -10,22 +9,17 @@ st.set_page_config(page_title="AI 뉴스 대시보드", layout="wide")
 GDRIVE_URL = st.text_input("📎 Google Drive 링크를 입력하세요:",
                            "https://drive.google.com/file/d/파일_ID/view?usp=sharing")
 
-def extract_file_id(gdrive_url):
-    try:
-        return gdrive_url.split("/d/")[1].split("/")[0]
-    except:
-        return None
+# 파일 ID별 변경 여부 확인 및 변환 결과 캐시 (프로세스 전체에서 공유)
+@st.cache_resource
+def get_drive_loader():
+    return DriveLoader()
 
 file_id = extract_file_id(GDRIVE_URL)
 
 if file_id:
-    download_url = f"https://drive.google.com/uc?id={file_id}"
-    output_file = "downloaded.xlsx"
-
-    # 2. 다운로드 시도
+    # 2. 변경된 경우에만 다운로드 시도
     try:
-        gdown.download(download_url, output_file, quiet=False)
-        df = pd.read_excel(output_file, engine="openpyxl")
+        df = get_drive_loader().load(file_id)
         st.success("✅ 파일 다운로드 및 불러오기 성공")
     except Exception as e:
         st.error(f"❌ 파일 다운로드 또는 읽기 실패: {e}")
@@ -1,33 +1,42 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from tempfile import NamedTemporaryFile
 from datetime import datetime
+from sheets_client import get_client, read_many
 
 st.set_page_config(page_title="AI 뉴스 대시보드", layout="wide")
 
-# 🔐 Google Sheets 인증 (Secrets에서 JSON 읽기)
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-json_str = st.secrets["google"]["credentials"]
-
-with NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-    temp_file.write(json_str)
-    temp_file.flush()
-    creds = ServiceAccountCredentials.from_json_keyfile_name(temp_file.name, scope)
-
-client = gspread.authorize(creds)
-
-# 📄 Google Sheet 열기
-SHEET_NAME = st.text_input("📎 불러올 구글 시트 이름:", "article")
-try:
-    sheet = client.open(SHEET_NAME).worksheet("article")  # ✅ 여기만 수정됨
-    data = sheet.get_all_records()
-    df = pd.DataFrame(data)
-    st.success("✅ Google Sheet에서 데이터 불러오기 성공")
-except Exception as e:
-    st.error(f"❌ 시트 불러오기 실패: {e}")
+# 화면에서 사용하는 컬럼만 읽음
+ARTICLE_COLUMNS = ["category", "title", "source", "summary", "url"]
+
+# 🔐 Google Sheets 인증 (Secrets의 JSON으로 프로세스당 한 번만 인증)
+# 여러 스프레드시트/워크시트를 동시에 읽어 하나로 합침
+@st.cache_data(ttl=60)
+def load_sheets(targets):
+    client = get_client(st.secrets["google"]["credentials"])
+    df, errors = read_many(client, targets, ARTICLE_COLUMNS)
+    return df, {f"{name}/{worksheet}" if worksheet else name: str(e) for (name, worksheet), e in errors.items()}
+
+def parse_targets(text):
+    """"시트/탭" 목록 (탭을 생략하면 첫 번째 탭)."""
+    targets = []
+    for item in text.split(","):
+        name, sep, worksheet = item.rpartition("/")
+        if not sep:
+            name, worksheet = worksheet, ""
+        if name.strip():
+            targets.append((name.strip(), worksheet.strip() or None))
+    return tuple(dict.fromkeys(targets))
+
+# 📄 Google Sheet 열기 (스프레드시트마다 탭 이름이 다를 수 있으므로 시트와 탭을 짝지어 입력)
+SHEET_TARGETS = parse_targets(st.text_input("📎 불러올 구글 시트/탭 이름 (여러 개는 쉼표로 구분, 예: article/article, 팀뉴스/기사):", "article/article"))
+
+df, load_errors = load_sheets(SHEET_TARGETS)
+for origin, error in load_errors.items():
+    st.warning(f"⚠️ {origin} 불러오기 실패: {error}")
+if df.empty:
+    st.error("❌ 시트 불러오기 실패" if load_errors else "📌 불러올 데이터가 없습니다. 시트 이름을 확인해주세요.")
     st.stop()
+st.success(f"✅ Google Sheet에서 데이터 불러오기 성공 ({df['origin'].nunique()}개 시트, {len(df)}건)")
 
 # 🗓 오늘 날짜
 st.title("📰 AI 뉴스 대시보드")
@@ -47,6 +56,7 @@ for category in categories:
 
     for idx, row in category_df.iterrows():
         with st.expander(f"📰 {row.get('title', '제목 없음')} ({row.get('source', '출처 없음')})"):
+            st.caption(f"🗂️ {row['origin']}")
             st.write(f"**요약:** {row.get('summary', '요약 없음')}")
             if pd.notna(row.get("url")) and row.get("url") != "":
                 st.markdown(f"[🔗 기사 보기]({row['url']})")
@@ -0,0 +1,56 @@
+import sqlite3
+import threading
+import time
+import zlib
+
+from body_fetcher import BodyFetcher, BodyStore
+from conftest import QuietHandler
+
+PARAGRAPH = "반도체 수출이 석 달 연속 늘어나며 역대 최대치를 기록했다."
+
+
+def test_body_store_round_trip_is_compressed(tmp_path):
+    store = BodyStore("bodies", cache_dir=str(tmp_path))
+    body = "\n".join([PARAGRAPH] * 50)
+    store.put("a1", "https://example.com/1", body, None)
+    store.put("a2", "https://example.com/2", None, "HTTP 404")
+
+    assert store.get_many(["a1", "a2", "없음"]) == {"a1": body}
+    info = store.info(["a1", "a2"])
+    assert list(info) == ["a1"] and info["a1"][0] == len(body)
+    blob = sqlite3.connect(store.path).execute("SELECT body FROM bodies WHERE article_id = 'a1'").fetchone()[0]
+    assert len(blob) < len(body.encode("utf-8"))
+    assert zlib.decompress(blob).decode("utf-8") == body
+
+
+def test_fetcher_caps_requests_per_domain(serve, tmp_path):
+    lock = threading.Lock()
+    active, peak, finished = {}, {}, {}
+
+    class Handler(QuietHandler):
+        def do_GET(self):
+            host = self.headers["Host"].partition(":")[0]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.3 if host == "127.0.0.1" else 0.01)
+            with lock:
+                active[host] -= 1
+                finished[self.path] = time.monotonic()
+            self.send_html(200, f"<article><p>{PARAGRAPH}</p></article>")
+
+    port = serve(Handler)
+    # 같은 서버를 두 이름으로 불러 느린 사이트(127.0.0.1)와 빠른 사이트(localhost)로 사용
+    slow = {f"s{i}": f"http://127.0.0.1:{port}/slow/{i}" for i in range(6)}
+    fast = {f"f{i}": f"http://localhost:{port}/fast/{i}" for i in range(6)}
+    done = threading.Event()
+    store = BodyStore("bodies", cache_dir=str(tmp_path))
+    fetcher = BodyFetcher(store, max_workers=4, per_domain=2, on_update=done.set)
+
+    assert fetcher.schedule({**slow, **fast}) == 12
+    assert done.wait(10)
+
+    assert peak == {"127.0.0.1": 2, "localhost": 2}
+    assert set(store.get_many(list(slow) + list(fast))) == set(slow) | set(fast)
+    # 느린 사이트가 풀을 모두 차지하지 않으므로 빠른 사이트는 먼저 끝남
+    assert max(finished[f"/fast/{i}"] for i in range(6)) < max(finished[f"/slow/{i}"] for i in range(6))
@@ -0,0 +1,53 @@
+import link_preview
+from conftest import QuietHandler
+from kv_cache import KVCache
+from link_preview import LinkPreviewService, fetch_preview
+
+PAGE = """<html><head>
+<title>페이지 제목</title>
+<meta property="og:title" content="OG 제목">
+<meta property="og:description" content="OG 설명">
+<meta property="og:image" content="https://example.com/a.png">
+</head><body>
+<meta property="og:site_name" content="본문에 있는 메타">
+<p>본문</p>
+</body></html>"""
+
+
+def test_fetch_preview_reads_open_graph_until_head_end(serve):
+    class Handler(QuietHandler):
+        def do_GET(self):
+            self.send_html(200, PAGE)
+
+    port = serve(Handler)
+    card = fetch_preview(f"http://127.0.0.1:{port}/article")
+
+    assert card["title"] == "OG 제목"
+    assert card["description"] == "OG 설명"
+    assert card["image"] == "https://example.com/a.png"
+    # </head> 뒤의 메타는 읽지 않음
+    assert card["site_name"] == ""
+    assert not card.get("failed")
+
+
+def test_failed_preview_is_retried_after_retry_window(serve, tmp_path, monkeypatch):
+    requests = []
+
+    class Handler(QuietHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            self.send_html(500 if len(requests) == 1 else 200, PAGE)
+
+    port = serve(Handler)
+    url = f"http://127.0.0.1:{port}/article"
+    service = LinkPreviewService(KVCache("previews", cache_dir=str(tmp_path)))
+
+    assert service.get_previews([url], wait_seconds=5)[url]["failed"]
+    # 재시도 시간 전에는 저장된 실패 결과를 그대로 사용
+    assert service.get_previews([url], wait_seconds=5)[url]["failed"]
+    assert len(requests) == 1
+
+    monkeypatch.setattr(link_preview, "FAILURE_RETRY_SECONDS", -1)
+    card = service.get_previews([url], wait_seconds=5)[url]
+    assert card["title"] == "OG 제목"
+    assert len(requests) == 2
@@ -0,0 +1,39 @@
+import re
+
+# --- 기사 제목/요약용 간단한 토큰화 (형태소 분석기 없이 동작) ---
+# 숫자만 있는 토큰("21")은 버리고 "2분기", "30%"처럼 단위가 붙은 숫자는 남김
+_TOKEN = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9]*|[0-9]+[A-Za-z가-힣%]+")
+# 긴 것부터 떼어야 "에서"가 "서"로 잘리지 않음
+_PARTICLES = sorted(
+    ["은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "으로", "로", "과", "와", "도", "만",
+     "까지", "부터", "보다", "이다", "했다", "한다", "하는", "하고", "했다고", "밝혔다", "라고"],
+    key=len, reverse=True,
+)
+STOPWORDS = {
+    "기자", "뉴스", "관련", "대한", "위해", "통해", "이번", "지난", "오는", "올해", "그리고", "하지만",
+    "있다", "없다", "했다", "밝혔다", "말했다", "것으로", "대해", "등", "및", "the", "and", "of", "to", "in",
+}
+
+
+def _strip_particle(word):
+    for particle in _PARTICLES:
+        if len(word) > len(particle) + 1 and word.endswith(particle):
+            return word[:-len(particle)]
+    return word
+
+
+def tokenize(text, min_length=2):
+    if not isinstance(text, str) or not text:
+        return []
+    tokens = []
+    for match in _TOKEN.findall(text):
+        word = _strip_particle(match.lower())
+        if len(word) >= min_length and word not in STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+def article_text(df):
+    # 제목은 요약보다 핵심어가 많으므로 두 번 넣어 가중치를 줌
+    title = df["title"].fillna("").astype(str)
+    return (title + " " + title + " " + df["summary"].fillna("").astype(str)).tolist()
@@ -0,0 +1,197 @@
+import math
+import os
+import pickle
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from kv_cache import CACHE_DIR
+from text_utils import article_text, tokenize
+
+NO_TOPIC = -1
+MAX_VOCAB = 50000
+LABEL_TERMS = 3
+
+
+# --- 주제(토픽) 자동 분류: TF-IDF + 미니배치 k-means (새로 들어온 기사만 학습/배정) ---
+class TopicModel:
+    """시트의 theme/category와 별개로 기사 내용으로 토픽을 나눔. 상태는 디스크에 저장해 재시작 후에도 이어서 학습."""
+
+    def __init__(self, name="articles", max_topics=30, new_topic_similarity=0.15, batch_size=256, cache_dir=None):
+        cache_dir = os.path.join(cache_dir or CACHE_DIR, "topics")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{name}.pkl")
+        self.max_topics = max_topics
+        self.new_topic_similarity = new_topic_similarity
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(0)
+        self._reset()
+        self._restore()
+
+    def _reset(self):
+        self.vocab = {}
+        self.terms = []
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.n_docs = 0
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.center_counts = np.zeros(0, dtype=np.int64)
+        self.assignments = {}
+        self.labels = {}
+
+    def _restore(self):
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        self.__dict__.update(state)
+
+    def _persist(self):
+        state = {key: getattr(self, key) for key in (
+            "vocab", "terms", "doc_freq", "n_docs", "centroids", "center_counts", "assignments", "labels")}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    # --- 어휘/문서 빈도 갱신 후 TF-IDF 벡터 (희소: 열 번호, 값) ---
+    def _grow_vocab(self, token_lists):
+        for tokens in token_lists:
+            for term in set(tokens):
+                if term not in self.vocab and len(self.vocab) < MAX_VOCAB:
+                    self.vocab[term] = len(self.terms)
+                    self.terms.append(term)
+        if len(self.terms) > len(self.doc_freq):
+            grow = len(self.terms) - len(self.doc_freq)
+            self.doc_freq = np.concatenate([self.doc_freq, np.zeros(grow, dtype=np.int64)])
+            self.centroids = np.pad(self.centroids, ((0, 0), (0, grow)))
+        for tokens in token_lists:
+            columns = [self.vocab[t] for t in set(tokens) if t in self.vocab]
+            self.doc_freq[columns] += 1
+        self.n_docs += len(token_lists)
+
+    def _vectorize(self, tokens):
+        counts = Counter(t for t in tokens if t in self.vocab)
+        if not counts:
+            return None
+        columns = np.fromiter((self.vocab[t] for t in counts), dtype=np.int64, count=len(counts))
+        tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        idf = np.log((1.0 + self.n_docs) / (1.0 + self.doc_freq[columns])) + 1.0
+        values = (tf * idf).astype(np.float32)
+        return columns, values / np.linalg.norm(values)
+
+    def _similarities(self, vector):
+        columns, values = vector
+        return self.centroids[:, columns] @ values
+
+    def _add_topic(self, vector):
+        columns, values = vector
+        centroid = np.zeros(len(self.terms), dtype=np.float32)
+        centroid[columns] = values
+        self.centroids = np.vstack([self.centroids, centroid]) if len(self.centroids) else centroid[None, :]
+        self.center_counts = np.append(self.center_counts, 1)
+        return len(self.centroids) - 1
+
+    def _seed(self, vectors):
+        """k-means++ 방식으로 서로 멀리 떨어진 기사들을 첫 토픽 중심으로 선택하고, 고른 기사 번호를 반환."""
+        k = min(self.max_topics, max(1, int(math.sqrt(len(vectors) / 2))))
+        seeds = [int(self._rng.integers(len(vectors)))]
+        self._add_topic(vectors[seeds[0]])
+        while len(self.centroids) < k:
+            distance = np.array([1.0 - max(self._similarities(v).max(), 0.0) for v in vectors]) ** 2
+            if distance.sum() <= 0:
+                break
+            seeds.append(int(self._rng.choice(len(vectors), p=distance / distance.sum())))
+            self._add_topic(vectors[seeds[-1]])
+        return set(seeds)
+
+    def _train_batch(self, vectors):
+        seeds = self._seed(vectors) if not len(self.centroids) else set()
+        for i, vector in enumerate(vectors):
+            if i in seeds:
+                # 중심을 만들 때 이미 한 번 반영한 기사
+                continue
+            similarities = self._similarities(vector)
+            best = int(similarities.argmax())
+            if similarities[best] < self.new_topic_similarity and len(self.centroids) < self.max_topics:
+                # 기존 토픽과 거의 겹치지 않는 기사는 새 토픽으로 시작
+                self._add_topic(vector)
+                continue
+            # 토픽마다 배정된 기사 수에 반비례하는 학습률로 중심을 이동 (Sculley 미니배치 k-means)
+            self.center_counts[best] += 1
+            rate = 1.0 / self.center_counts[best]
+            columns, values = vector
+            centroid = self.centroids[best]
+            centroid *= 1.0 - rate
+            centroid[columns] += rate * values
+            centroid /= max(np.linalg.norm(centroid), 1e-12)
+
+    def _update_labels(self):
+        # 화면의 토픽 필터는 이름으로 묶으므로, 이름이 겹치면 다음 순위 단어를 붙이고 그래도 겹치면 번호를 붙임
+        used = set()
+        for topic_id, centroid in enumerate(self.centroids):
+            ranked = [self.terms[i] for i in np.argsort(centroid)[::-1][:LABEL_TERMS + 3] if centroid[i] > 0]
+            label = " · ".join(ranked[:LABEL_TERMS])
+            for extra in ranked[LABEL_TERMS:]:
+                if label not in used:
+                    break
+                label = f"{label} · {extra}"
+            if not label or label in used:
+                label = f"{label} ({topic_id + 1})" if label else f"토픽 {topic_id + 1}"
+            used.add(label)
+            self.labels[topic_id] = label
+
+    # --- 아직 토픽이 없는 기사만 학습하고 배정 (이미 배정된 기사의 토픽은 바뀌지 않음) ---
+    def update(self, df):
+        with self._lock:
+            new_df = df[~df.index.isin(list(self.assignments))]
+            if new_df.empty:
+                return False
+            if "day" in new_df.columns:
+                new_df = new_df.sort_values("day", kind="stable")
+            token_lists = [tokenize(text) for text in article_text(new_df)]
+            self._grow_vocab(token_lists)
+            vectors = [self._vectorize(tokens) for tokens in token_lists]
+
+            usable = [v for v in vectors if v is not None]
+            for start in range(0, len(usable), self.batch_size):
+                self._train_batch(usable[start:start + self.batch_size])
+            self._update_labels()
+
+            for idx, vector in zip(new_df.index, vectors):
+                if vector is None:
+                    self.assignments[idx] = NO_TOPIC
+                else:
+                    self.assignments[idx] = int(self._similarities(vector).argmax())
+            try:
+                self._persist()
+            except OSError:
+                pass
+            return True
+
+    def assign(self, df):
+        """topic_id(정수, 없으면 -1)와 topic(토픽 이름) 컬럼을 추가한 사본을 반환."""
+        self.update(df)
+        with self._lock:
+            topic_ids = np.array([self.assignments.get(idx, NO_TOPIC) for idx in df.index], dtype=np.int64)
+            labels = dict(self.labels)
+        df = df.copy()
+        df["topic_id"] = topic_ids
+        df["topic"] = pd.Series(topic_ids, index=df.index).map(labels).astype("category")
+        return df
+
+
+# --- 트렌드 분석 프롬프트용 토픽 요약표 (기사 원문 대신 전달) ---
+def topic_summary(df, limit=10):
+    if df.empty or "topic_id" not in df.columns:
+        return pd.DataFrame(columns=["topic", "articles", "stories", "sources"])
+    grouped = df[df["topic_id"] != NO_TOPIC].groupby("topic", observed=True)
+    summary = pd.DataFrame({
+        "articles": grouped.size(),
+        "stories": grouped["story_id"].nunique() if "story_id" in df.columns else grouped.size(),
+        "sources": grouped["source"].nunique(),
+    })
+    return summary.sort_values("articles", ascending=False).head(limit).reset_index()
@@ -0,0 +1,128 @@
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from news_data import NO_DAY
+from text_utils import article_text, tokenize
+
+BASELINE_DAYS = 14
+MIN_RECENT_COUNT = 2
+
+
+# --- 수집 단계: 기사별 단어 기여분을 유지하며 날짜×테마×단어별 기사 수를 갱신 ---
+class TrendCounter:
+    """새 기사와 내용(날짜/테마/제목/요약)이 바뀐 기사만 토큰화. 바뀌거나 사라진 기사는 이전 기여분을 뺌.
+
+    기사 하나에 여러 번 나온 단어도 1로 셈.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._articles = {}   # 기사 ID → (내용 서명, day, theme, 단어 튜플)
+        self._term_counts = Counter()   # (day, theme, term) → 기사 수
+        self._doc_counts = Counter()    # (day, theme) → 기사 수
+
+    def _apply(self, day, theme, terms, sign):
+        if day == NO_DAY:
+            return
+        self._doc_counts[(day, theme)] += sign
+        for term in terms:
+            self._term_counts[(day, theme, term)] += sign
+
+    def update(self, df):
+        """{"trend_terms": (day, theme, term, n), "trend_docs": (day, theme, n)} 집계표를 반환 (스냅샷과 함께 게시)."""
+        days = df["day"].tolist()
+        themes = df["theme"].astype("string").fillna("").tolist()
+        texts = article_text(df)
+        with self._lock:
+            current = set(df.index)
+            for idx in [idx for idx in self._articles if idx not in current]:
+                _, day, theme, terms = self._articles.pop(idx)
+                self._apply(day, theme, terms, -1)
+            for idx, day, theme, text in zip(df.index, days, themes, texts):
+                signature = hash((day, theme, text))
+                previous = self._articles.get(idx)
+                if previous is not None:
+                    if previous[0] == signature:
+                        continue
+                    self._apply(*previous[1:], -1)
+                terms = tuple(set(tokenize(text)))
+                self._articles[idx] = (signature, day, theme, terms)
+                self._apply(day, theme, terms, 1)
+            for counts in (self._term_counts, self._doc_counts):
+                for key in [key for key, n in counts.items() if n <= 0]:
+                    del counts[key]
+            term_rows = [(day, theme, term, n) for (day, theme, term), n in self._term_counts.items()]
+            doc_rows = [(day, theme, n) for (day, theme), n in self._doc_counts.items()]
+        return {
+            "trend_terms": pd.DataFrame(term_rows, columns=["day", "theme", "term", "n"]),
+            "trend_docs": pd.DataFrame(doc_rows, columns=["day", "theme", "n"]),
+        }
+
+
+# --- 한 데이터셋 버전의 단어 빈도 시계열 (수집 단계에서 만든 집계표를 읽기만 함) ---
+class TrendIndex:
+    """급상승 키워드 계산용. 만든 뒤에는 바뀌지 않으므로 여러 세션이 함께 사용."""
+
+    def __init__(self, term_frame=None, doc_frame=None):
+        # (day, theme, term) → 기사 수, (day, theme) → 전체 기사 수
+        self._term_counts = self._to_series(term_frame, ["day", "theme", "term"])
+        self._doc_counts = self._to_series(doc_frame, ["day", "theme"])
+
+    def _to_series(self, frame, keys):
+        if frame is None or frame.empty:
+            return pd.Series(dtype="int64")
+        return frame.set_index(keys)["n"].astype("int64").sort_index()
+
+    def _select(self, series, themes, first_day, last_day):
+        days = series.index.get_level_values("day")
+        mask = (days >= first_day) & (days <= last_day)
+        if themes:
+            mask &= series.index.get_level_values("theme").isin(list(themes))
+        return series[mask]
+
+    # --- 급상승 키워드: 최근 구간 빈도를 직전 기준 구간의 하루 평균 비율과 비교 ---
+    def bursts(self, first_day, last_day, themes=None, baseline_days=BASELINE_DAYS, min_count=MIN_RECENT_COUNT, limit=20):
+        """first_day~last_day(정수 일자, 포함) 구간에서 평소보다 많이 나온 단어를 z 점수 순으로 반환."""
+        term_counts, doc_counts = self._term_counts, self._doc_counts
+        columns = ["키워드", "최근 기사 수", "평소 하루 평균", "증가율", "z 점수"]
+        if term_counts.empty:
+            return pd.DataFrame(columns=columns)
+        baseline_first = first_day - baseline_days
+
+        recent = self._select(term_counts, themes, first_day, last_day).groupby(level="term").sum()
+        recent = recent[recent >= min_count]
+        if recent.empty:
+            return pd.DataFrame(columns=columns)
+        baseline = self._select(term_counts, themes, baseline_first, first_day - 1).groupby(level="term").sum()
+        baseline = baseline.reindex(recent.index, fill_value=0)
+        recent_docs = self._select(doc_counts, themes, first_day, last_day).sum()
+        baseline_docs = self._select(doc_counts, themes, baseline_first, first_day - 1).sum()
+
+        recent_values = recent.to_numpy(dtype=float)
+        # 기준 구간의 기사당 등장 비율로 최근 구간의 기대 빈도를 계산 (기준 구간이 비면 0에 가까운 값으로 시작)
+        rate = (baseline.to_numpy(dtype=float) + 0.5) / (baseline_docs + 1.0)
+        expected = rate * recent_docs
+        z = (recent_values - expected) / np.sqrt(expected + 1.0)
+        result = pd.DataFrame({
+            "키워드": recent.index.tolist(),
+            "최근 기사 수": recent.to_numpy(),
+            "평소 하루 평균": np.round(baseline.to_numpy() / baseline_days, 2),
+            "증가율": np.round(recent_values / np.maximum(expected, 0.5), 1),
+            "z 점수": np.round(z, 2),
+        })
+        return result[result["z 점수"] > 0].sort_values("z 점수", ascending=False).head(limit).reset_index(drop=True)
+
+    def daily_counts(self, words, first_day, last_day, themes=None):
+        """선택한 단어들의 날짜별 기사 수 (행: 날짜, 열: 단어)."""
+        term_counts = self._term_counts
+        words = list(dict.fromkeys(words))
+        frame = pd.DataFrame(0, index=pd.RangeIndex(first_day, last_day + 1, name="day"), columns=words)
+        if not words or term_counts.empty:
+            return frame
+        selected = self._select(term_counts, themes, first_day, last_day)
+        selected = selected[selected.index.get_level_values("term").isin(words)]
+        by_day = selected.groupby(level=["day", "term"]).sum().unstack(fill_value=0)
+        return frame.add(by_day, fill_value=0).astype("int64")
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import threading
+import zlib
+
+import pandas as pd
+
+from aho_corasick import AhoCorasick
+from entity_index import ENTITY_SEPARATOR
+from kv_cache import CACHE_DIR
+
+# --- 관심 키워드 목록 파일 (한 줄에 하나, #으로 시작하는 줄은 주석) ---
+# NEWS_WATCHLIST_FILE 환경 변수로 경로를 바꿀 수 있음 (없으면 캐시 폴더에 저장)
+WATCHLIST_FILE = os.environ.get("NEWS_WATCHLIST_FILE") or os.path.join(CACHE_DIR, "watchlist.txt")
+DEFAULT_TERMS = ["반도체", "배터리", "AI", "ESG", "수소", "인수합병", "실적", "투자"]
+
+
+def clean_terms(terms):
+    """공백 정리, 구분자(|) 제거, 대소문자 무시 중복 제거."""
+    result = {}
+    for term in terms:
+        term = " ".join(str(term).replace(ENTITY_SEPARATOR, " ").split())
+        if term and not term.startswith("#"):
+            result.setdefault(term.lower(), term)
+    return list(result.values())
+
+
+# --- 관심 키워드 전체를 자동자 하나로 만들어 기사마다 한 번만 훑음 ---
+class Watchlist:
+    """기사별 일치 결과는 키워드 목록 지문, 본문 버전, 제목/요약 CRC와 함께 캐시 (모두 같으면 다시 검사하지 않음)."""
+
+    def __init__(self, cache, path=None):
+        self.cache = cache
+        self.path = path or WATCHLIST_FILE
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._terms = []
+        self._automaton = AhoCorasick([])
+        self._fingerprint = ""
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            if mtime == self._mtime and self._fingerprint:
+                return
+        if mtime is None:
+            terms = clean_terms(DEFAULT_TERMS)
+        else:
+            with open(self.path, "r", encoding="utf-8") as f:
+                terms = clean_terms(f.read().splitlines())
+        automaton = AhoCorasick(terms)
+        fingerprint = hashlib.sha1("\n".join(t.lower() for t in terms).encode("utf-8")).hexdigest()
+        with self._lock:
+            self._mtime, self._terms, self._automaton, self._fingerprint = mtime, terms, automaton, fingerprint
+
+    def terms(self):
+        self._reload()
+        with self._lock:
+            return list(self._terms)
+
+    def save(self, terms):
+        """목록을 파일에 저장 (다른 프로세스도 다음 갱신 때 읽음)."""
+        terms = clean_terms(terms)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(terms) + "\n")
+        os.replace(tmp_path, self.path)
+        self._reload()
+        return terms
+
+    def _current(self):
+        with self._lock:
+            return self._terms, self._automaton, self._fingerprint
+
+    def find(self, text, current=None):
+        """텍스트에 나온 키워드 목록 (겹치는 키워드도 모두, 목록 순서)."""
+        terms, automaton, _ = current or self._current()
+        if not isinstance(text, str) or not text:
+            return []
+        found = {pattern_id for _, _, pattern_id in automaton.iter_matches(text)}
+        return [terms[i] for i in sorted(found)]
+
+    def tag(self, df, bodies):
+        """watch_terms 컬럼("반도체|AI" 형식)을 추가한 사본을 반환. 제목/요약/본문이 바뀐 기사만 다시 검사.
+
+        bodies: 본문 버전(version)과 본문(get_many)을 주는 객체 (ArticleBodies). 다시 검사할 기사의 본문만 읽음.
+        """
+        self._reload()
+        current = self._current()
+        fingerprint = current[2]
+        df = df.copy()
+        cached = self.cache.get_many(df.index)
+        heads = (df["title"].fillna("").astype(str) + "\n" + df["summary"].fillna("").astype(str)).to_dict()
+        # 캐시 키: 키워드 목록 지문 + 본문 버전 + 제목/요약 CRC (본문 전체를 해시하지 않음)
+        keys, stale = {}, []
+        for idx, head in heads.items():
+            keys[idx] = {"fp": fingerprint, "body": bodies.version(idx), "head": zlib.crc32(head.encode("utf-8"))}
+            entry = cached.get(idx)
+            if entry is None or any(entry.get(k) != v for k, v in keys[idx].items()):
+                stale.append(idx)
+        texts = bodies.get_many(stale)
+        updates = {}
+        for idx in stale:
+            text = heads[idx] + ("\n" + texts[idx] if idx in texts else "")
+            updates[idx] = cached[idx] = dict(keys[idx], terms=self.find(text, current))
+        self.cache.set_many(updates)
+        tags = [ENTITY_SEPARATOR.join(cached[idx]["terms"]) for idx in df.index]
+        df["watch_terms"] = pd.array(tags, dtype="string").fillna("")
+        return df